@@ -6,6 +6,9 @@ from typing import List, Dict, Optional
 from datetime import datetime
 from src.security.cookie_manager import CookieManager
 from src.utils.paths import get_data_dir
+from src.utils.logger import get_logger
+
+logger = get_logger("accounts")
 
 
 class AccountManager:
@@ -51,7 +54,7 @@ class AccountManager:
                     else:
                         self.accounts = []
             except Exception as e:
-                print(f"⚠️ Error loading accounts: {e}")
+                logger.warning(f"⚠️ Error loading accounts: {e}")
                 self.accounts = []
         else:
             self.accounts = []
@@ -77,7 +80,7 @@ class AccountManager:
         
         if len(cleaned) < initial_count:
             self.accounts = cleaned
-            print(f"🧹 Purged {initial_count - len(cleaned)} invalid/masked accounts from list.")
+            logger.info(f"🧹 Purged {initial_count - len(cleaned)} invalid/masked accounts from list.")
             self._save_accounts()
     
     def _save_accounts(self):
@@ -99,7 +102,7 @@ class AccountManager:
                 acc["status"] = status
                 acc["last_login"] = datetime.now().isoformat()
                 self._save_accounts()
-                print(f"🔄 Account updated: {email}")
+                logger.info(f"🔄 Account updated: {email}")
                 return True
 
         account = {
@@ -114,7 +117,7 @@ class AccountManager:
         
         self.accounts.append(account)
         self._save_accounts()
-        print(f"✅ Account added: {email}")
+        logger.info(f"✅ Account added: {email}")
         return True
     
     def remove_account(self, email: str) -> bool:
@@ -124,7 +127,7 @@ class AccountManager:
         self._save_accounts()
         # Also delete cookies
         self.cookie_manager.delete_cookies(email)
-        print(f"✅ Account removed: {email}")
+        logger.info(f"✅ Account removed: {email}")
         return True
     
     def get_account(self, email: str) -> Optional[Dict]:
@@ -157,7 +160,7 @@ class AccountManager:
                 break
         self._save_accounts()
         self._save_accounts()
-        print(f"💾 Account status updated: {email} -> {status}")
+        logger.info(f"💾 Account status updated: {email} -> {status}")
 
     def check_cookie_expiry(self, email: str) -> int:
         """Check days until cookie expiry. Returns -1 if invalid."""
@@ -171,4 +174,10 @@ class AccountManager:
                 acc["status"] = status
                 break
         self._save_accounts()
-        print(f"🔄 Account {email} status changed to: {status}")
+        logger.info(f"🔄 Account {email} status changed to: {status}")
+
+    def clear_needs_login(self, email: str):
+        """Mark a flagged account active again after it signed in successfully."""
+        account = self.get_account(email)
+        if account and account.get("status") == "needs_login":
+            self.update_account_status(account["email"], "active")
@@ -0,0 +1,88 @@
+# Async Connector - awaitable API over the blocking DrissionPage connector
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from .epic_drission_connector import ClaimCancelled, EpicDrissionConnector
+
+
+class AsyncDrissionConnector:
+    """Awaitable facade over EpicDrissionConnector.
+
+    Every browser gets exactly one dedicated driver thread; calls are queued on
+    it and awaited as futures, so concurrent accounts cost one thread per
+    browser rather than one blocked thread per wait. Each method runs one whole
+    blocking connector call (claim_game included); only the pauses between
+    calls are `asyncio.sleep`s. Cancelling an awaiting task sets the connector's
+    cancel event, which interrupts its internal sleeps promptly.
+    """
+
+    def __init__(self, connector: EpicDrissionConnector):
+        self.connector = connector
+        name = (connector.account_email or "new").split("@")[0]
+        self._driver = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"driver-{name}")
+        self._closed = False
+
+    @property
+    def account_email(self) -> Optional[str]:
+        return self.connector.account_email
+
+    @property
+    def last_real_account_key(self) -> Optional[str]:
+        return self.connector.last_real_account_key
+
+    async def _call(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        # Carry the caller's log context (run/account) onto the driver thread
+        ctx = contextvars.copy_context()
+        future = loop.run_in_executor(self._driver, functools.partial(ctx.run, fn, *args, **kwargs))
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # Interrupt the blocking call on the driver thread as well
+            self.connector.cancel()
+            raise
+        except ClaimCancelled as e:
+            # The driver saw the cancel event first: surface it as a normal
+            # task cancellation so every CancelledError handler applies
+            raise asyncio.CancelledError() from e
+
+    async def initialize(self, force_visible: bool = False) -> bool:
+        return await self._call(self.connector.initialize, force_visible)
+
+    async def login(self, email: str, password: str = "", allow_manual: bool = True) -> bool:
+        return await self._call(self.connector.login, email, password, allow_manual)
+
+    async def get_free_games(self) -> List[Dict]:
+        return await self._call(self.connector.get_free_games)
+
+    async def check_claimed_games(self) -> List[str]:
+        return await self._call(self.connector.check_claimed_games)
+
+    async def claim_game(self, url: str, name: str, checkpoint=None) -> bool:
+        return await self._call(self.connector.claim_game, url, name, checkpoint)
+
+    async def wait(self, seconds: float) -> None:
+        """Pause without holding a thread."""
+        await asyncio.sleep(seconds)
+
+    def cancel(self) -> None:
+        """Request cancellation of whatever the driver thread is doing."""
+        self.connector.cancel()
+
+    def kill(self) -> None:
+        """Synchronous hard stop (signal handlers): cancel and kill our browser PID."""
+        self._closed = True
+        self.connector.kill()
+        self._driver.shutdown(wait=False, cancel_futures=True)
+
+    async def close(self) -> None:
+        """Tear the browser down, even if the driver thread is still busy."""
+        if self._closed:
+            return
+        self._closed = True
+        # Run on a separate thread: a cancelled call may still occupy the driver
+        await asyncio.to_thread(self.connector.close)
+        self._driver.shutdown(wait=False, cancel_futures=True)
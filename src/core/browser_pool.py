@@ -0,0 +1,165 @@
+# Browser Pool - several isolated accounts per Chromium process
+import threading
+from typing import List, Optional, Tuple
+
+from DrissionPage import Chromium, ChromiumOptions
+
+from src.utils.process import terminate_process
+from .browser_watchdog import get_watchdog
+from src.utils.logger import get_logger
+
+logger = get_logger("browser")
+
+
+def browser_process_id(page_or_browser):
+    """PID of the Chromium process behind a page/browser object (None if unknown)."""
+    for holder in (page_or_browser, getattr(page_or_browser, "browser", None)):
+        pid = getattr(holder, "process_id", None)
+        if pid:
+            return pid
+    return None
+
+
+def browser_user_data_path(page_or_browser):
+    """Profile directory of the browser (DrissionPage's temp dir with auto_port)."""
+    for holder in (page_or_browser, getattr(page_or_browser, "browser", None)):
+        path = getattr(holder, "user_data_path", None)
+        if path:
+            return str(path)
+    return None
+
+
+def build_chromium_options(force_visible: bool = False, force_headless: bool = False) -> ChromiumOptions:
+    """Launch options shared by per-account browsers and pooled browsers.
+
+    `force_headless` overrides the headless_mode setting (background jobs).
+    """
+    co = ChromiumOptions()
+
+    # Let DrissionPage find a free port automatically for maximum reliability
+    co.auto_port()
+
+    # Config: Check Headless Mode
+    from src.utils.config import ConfigManager
+    config = ConfigManager()
+    is_headless = force_headless or (config.get("headless_mode", True) and not force_visible)
+    logger.info(f"   👻 Stealth Mode: {'ENABLED' if is_headless else 'DISABLED'}")
+
+    co.headless(is_headless)
+    co.set_argument('--no-sandbox')
+    co.set_argument('--disable-gpu')
+    co.set_argument('--disable-dev-shm-usage')
+    co.set_argument('--window-size=1280,1024')
+
+    # STABILITY: Disable profiles as they cause 'unpack' errors in this specific environment.
+    # We strictly use JSON cookie injection for session persistence across all domains.
+    return co
+
+
+class _PooledBrowser:
+    def __init__(self, slots: int = 1):
+        self.slots = slots
+        self.browser = None
+        self.pid = None
+        self.tabs = 0
+        self.error: Optional[Exception] = None
+        self.ready = threading.Event()   # Set once launch() finished, either way
+
+    def launch(self):
+        try:
+            logger.info(f"🛠️ Opening shared browser (context mode)...")
+            self.browser = Chromium(build_chromium_options())
+            self.pid = browser_process_id(self.browser)
+            get_watchdog().register(
+                self.pid, label="shared browser", port=self.browser.address.split(':')[-1],
+                user_data_path=browser_user_data_path(self.browser), on_kill=self.quit,
+                slots=self.slots  # Up to `slots` account tabs: RSS limit scales with them
+            )
+        except Exception as e:
+            self.error = e
+            raise
+        finally:
+            self.ready.set()
+
+    def quit(self):
+        if self.browser is None:
+            return
+        try:
+            self.browser.quit()
+        except Exception:
+            pass
+        if self.pid:
+            terminate_process(self.pid)
+            get_watchdog().unregister(self.pid)
+
+
+class BrowserPool:
+    """Hand out account tabs, each in its own browser context (separate cookies/storage).
+
+    A Chromium process hosts up to `tabs_per_browser` accounts; another process
+    is only started when every existing one is full. Trades per-process crash
+    isolation for one browser's baseline memory per group of accounts.
+    """
+
+    def __init__(self, tabs_per_browser: int = 5):
+        self.tabs_per_browser = max(1, tabs_per_browser)
+        self._browsers: List[_PooledBrowser] = []
+        self._lock = threading.Lock()
+
+    def acquire_tab(self) -> Tuple[object, _PooledBrowser]:
+        """Open a tab in a fresh browser context. Returns (tab, owning browser).
+
+        The slot is reserved under the lock; Chromium is launched outside it,
+        so other accounts are not held up while a new browser starts.
+        """
+        with self._lock:
+            host = next((b for b in self._browsers if b.tabs < self.tabs_per_browser), None)
+            launch = host is None
+            if launch:
+                host = _PooledBrowser(self.tabs_per_browser)
+                self._browsers.append(host)
+            host.tabs += 1
+        try:
+            if launch:
+                host.launch()
+            else:
+                host.ready.wait()
+                if host.error is not None:
+                    raise RuntimeError(f"Shared browser failed to start: {host.error}")
+            tab = host.browser.new_tab(new_context=True)
+        except Exception:
+            with self._lock:
+                host.tabs -= 1
+                if host.error is not None and host in self._browsers:
+                    self._browsers.remove(host)
+            raise
+        return tab, host
+
+    def release_tab(self, tab, host: _PooledBrowser) -> None:
+        """Close the tab (and its context); quit the browser once it hosts nothing."""
+        try:
+            tab.close()
+        except Exception:
+            pass
+        with self._lock:
+            host.tabs -= 1
+            empty = host.tabs <= 0
+            if empty and host in self._browsers:
+                self._browsers.remove(host)
+        if empty:
+            host.quit()
+
+    def close_all(self) -> None:
+        with self._lock:
+            browsers, self._browsers = self._browsers, []
+        for host in browsers:
+            host.quit()
+
+    def kill_all(self) -> None:
+        """Hard-stop every pooled browser process (no graceful quit)."""
+        with self._lock:
+            browsers, self._browsers = self._browsers, []
+        for host in browsers:
+            if host.pid:
+                terminate_process(host.pid)
+                get_watchdog().unregister(host.pid)
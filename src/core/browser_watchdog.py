@@ -0,0 +1,282 @@
+# Browser Watchdog - PID registry, orphan reaping and per-session resource limits
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+from src.utils.paths import get_data_dir
+from src.utils.process import pid_alive, terminate_process
+from src.utils.logger import get_logger
+
+logger = get_logger("watchdog")
+
+REGISTRY_FILE = "browsers.json"
+
+
+def _process_create_time(pid: int) -> Optional[float]:
+    try:
+        return psutil.Process(pid).create_time()
+    except Exception:
+        return None
+
+
+def _looks_like_browser(pid: int, entry: Dict) -> bool:
+    """Guard against PID reuse before killing anything from the registry."""
+    try:
+        proc = psutil.Process(pid)
+        if entry.get("create_time") and abs(proc.create_time() - entry["create_time"]) > 1:
+            return False
+        return "chrom" in proc.name().lower() or "edge" in proc.name().lower()
+    except Exception:
+        return False
+
+
+class _Session:
+    def __init__(self, pid: int, label: str, on_kill: Callable[[], None], slots: int = 1):
+        self.pid = pid
+        self.label = label
+        self.slots = max(1, slots)   # Accounts the browser hosts (context mode): scales the RSS limit
+        self.on_kill = on_kill
+        self.rss_mb = 0.0
+        self.peak_rss_mb = 0.0
+        self.cpu_percent = 0.0
+        self.cpu_strikes = 0
+        self._procs: Dict[int, object] = {}
+
+    def sample(self) -> bool:
+        """Refresh RSS/CPU over the browser and its child processes (renderers, GPU)."""
+        try:
+            root = psutil.Process(self.pid)
+            procs = [root] + root.children(recursive=True)
+        except Exception:
+            return False
+        rss = 0
+        cpu = 0.0
+        seen = {}
+        for proc in procs:
+            # Reuse Process objects so cpu_percent() measures since the last sample
+            proc = self._procs.get(proc.pid, proc)
+            try:
+                rss += proc.memory_info().rss
+                cpu += proc.cpu_percent(None)
+                seen[proc.pid] = proc
+            except Exception:
+                continue
+        self._procs = seen
+        self.rss_mb = rss / (1024 * 1024)
+        self.peak_rss_mb = max(self.peak_rss_mb, self.rss_mb)
+        self.cpu_percent = cpu
+        return True
+
+    def as_dict(self) -> Dict:
+        return {
+            "pid": self.pid,
+            "label": self.label,
+            "rss_mb": round(self.rss_mb, 1),
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+            "cpu_percent": round(self.cpu_percent, 1),
+        }
+
+
+class BrowserWatchdog:
+    """Track every Chromium we spawn and clean up after crashes.
+
+    Each launched browser is written to `<data dir>/browsers.json` with the PID
+    of the process that owns it. Entries whose owner is gone (crashed run), or
+    that are ours but no longer belong to a live session (a swallowed quit()
+    failure), are killed on startup and then periodically, together with their
+    temporary profile directory. Live sessions are also sampled and killed
+    when they exceed `browser_max_rss_mb` (per hosted account) or stay above
+    `browser_max_cpu_percent` for several samples in a row. The watchdog
+    starts itself when the first browser is registered.
+    """
+
+    CPU_STRIKES = 3
+
+    def __init__(self, registry_path: str = None):
+        from src.utils.config import ConfigManager
+        config = ConfigManager()
+        self.registry_path = registry_path or os.path.join(get_data_dir(), REGISTRY_FILE)
+        self.interval = max(5, int(config.get("watchdog_interval_seconds", 30)))
+        self.reap_every = max(self.interval, int(config.get("watchdog_reap_minutes", 10)) * 60)
+        self.max_rss_mb = float(config.get("browser_max_rss_mb", 1536) or 0)
+        self.max_cpu_percent = float(config.get("browser_max_cpu_percent", 0) or 0)
+        self._sessions: Dict[int, _Session] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    # --- Registry ---
+
+    def _load(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.registry_path):
+            return {}
+        try:
+            with open(self.registry_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save(self, entries: Dict[str, Dict]) -> None:
+        tmp = self.registry_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp, self.registry_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Browser registry save error: {e}")
+
+    def register(self, pid: int, label: str = "", port: str = None, user_data_path: str = None,
+                 on_kill: Callable[[], None] = None, slots: int = 1) -> None:
+        """Record a browser we just launched. `on_kill` tears its session down.
+
+        `slots` is how many accounts share the browser; its RSS limit is
+        `browser_max_rss_mb` per slot.
+        """
+        if not pid:
+            return
+        self.start()
+        with self._lock:
+            entries = self._load()
+            entries[str(pid)] = {
+                "owner_pid": os.getpid(),
+                "label": label,
+                "port": port,
+                "user_data_path": user_data_path,
+                "create_time": _process_create_time(pid),
+                "started": datetime.now().isoformat(),
+            }
+            self._save(entries)
+            self._sessions[pid] = _Session(pid, label, on_kill or (lambda: terminate_process(pid)), slots)
+
+    def unregister(self, pid: int) -> Optional[Dict]:
+        """Forget a browser once it is confirmed gone. Returns its last stats."""
+        if not pid:
+            return None
+        with self._lock:
+            session = self._sessions.pop(pid, None)
+            if pid_alive(pid):
+                # Still running: leave it in the registry for the next reap
+                return session.as_dict() if session else None
+            entries = self._load()
+            entry = entries.pop(str(pid), None)
+            if entry is not None:
+                self._save(entries)
+        if entry:
+            self._remove_profile(entry)
+        return session.as_dict() if session else None
+
+    @staticmethod
+    def _remove_profile(entry: Dict) -> None:
+        path = entry.get("user_data_path")
+        # Only DrissionPage's auto-port temp profiles, never a user profile
+        if path and "DrissionPage" in path and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+    def reap_orphans(self) -> int:
+        """Kill registered browsers that no live session owns. Returns how many were reaped."""
+        me = os.getpid()
+        reaped = 0
+        with self._lock:
+            entries = self._load()
+            live = set(self._sessions)
+            keep = {}
+            stale = []
+            for key, entry in entries.items():
+                pid = int(key)
+                owner = entry.get("owner_pid")
+                owned_by_other_run = owner != me and pid_alive(owner)
+                if owned_by_other_run or (owner == me and pid in live):
+                    keep[key] = entry
+                else:
+                    stale.append((pid, entry))
+            if len(keep) != len(entries):
+                self._save(keep)
+
+        for pid, entry in stale:
+            if pid_alive(pid) and _looks_like_browser(pid, entry):
+                terminate_process(pid)
+                reaped += 1
+            self._remove_profile(entry)
+        if reaped:
+            logger.info(f"🧹 Reaped {reaped} orphaned browser process(es)")
+        return reaped
+
+    # --- Live sessions ---
+
+    def stats(self) -> List[Dict]:
+        """Live RSS/CPU per session, as of the last sample."""
+        with self._lock:
+            return [s.as_dict() for s in self._sessions.values()]
+
+    def check_limits(self) -> List[Dict]:
+        """Sample every session and kill the ones over their limits."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+
+        killed = []
+        for s in sessions:
+            if not s.sample():
+                continue
+            reason = None
+            max_rss_mb = self.max_rss_mb * s.slots
+            if max_rss_mb and s.rss_mb > max_rss_mb:
+                reason = f"RSS {s.rss_mb:.0f} MB > {max_rss_mb:.0f} MB"
+            if self.max_cpu_percent:
+                s.cpu_strikes = s.cpu_strikes + 1 if s.cpu_percent > self.max_cpu_percent else 0
+                if s.cpu_strikes >= self.CPU_STRIKES:
+                    reason = f"CPU {s.cpu_percent:.0f}% > {self.max_cpu_percent:.0f}% for {s.cpu_strikes} samples"
+            if not reason:
+                continue
+            logger.info(f"🐶 Watchdog: killing browser {s.pid} ({s.label}): {reason}")
+            try:
+                s.on_kill()
+            except Exception as e:
+                logger.warning(f"⚠️ Watchdog kill error: {e}")
+                terminate_process(s.pid)
+            killed.append(dict(s.as_dict(), reason=reason))
+        return killed
+
+    def _loop(self):
+        last_reap = time.monotonic()
+        while not self._stop.wait(self.interval):
+            try:
+                self.check_limits()
+                if time.monotonic() - last_reap >= self.reap_every:
+                    last_reap = time.monotonic()
+                    self.reap_orphans()
+            except Exception as e:
+                logger.warning(f"⚠️ Watchdog error: {e}")
+
+    def start(self) -> threading.Thread:
+        """Reap leftovers from earlier runs, then watch in a daemon thread."""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return self._thread
+            self.reap_orphans()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, daemon=True, name="browser-watchdog")
+            self._thread.start()
+            return self._thread
+
+    def stop(self):
+        self._stop.set()
+
+
+_watchdog: Optional[BrowserWatchdog] = None
+_watchdog_lock = threading.Lock()
+
+
+def get_watchdog() -> BrowserWatchdog:
+    """Process-wide watchdog shared by connectors, the browser pool and the refresher."""
+    global _watchdog
+    with _watchdog_lock:
+        if _watchdog is None:
+            _watchdog = BrowserWatchdog()
+        return _watchdog
@@ -0,0 +1,120 @@
+# Catalog - parse the freeGamesPromotions payload into stable offers
+from typing import Dict, List, Optional
+
+import requests
+from src.utils.logger import get_logger
+
+logger = get_logger("catalog")
+
+PROMOTIONS_URL = 'https://store-site-backend-static-ipv4.ak.epicgames.com/freeGamesPromotions?locale=en-US&country=US&allowCountries=US'
+STORE_PRODUCT_URL = "https://store.epicgames.com/en-US/p/{slug}"
+
+# keyImages types in order of preference for cover art (portrait first)
+_IMAGE_TYPES = ("OfferImageTall", "DieselStoreFrontTall", "Thumbnail", "CodeRedemption_340x440",
+                "OfferImageWide", "DieselStoreFrontWide")
+
+
+def canonical_game_id(namespace: Optional[str], offer_id: Optional[str]) -> Optional[str]:
+    """Compact, stable identity of an offer: "<namespace>:<offer id>"."""
+    if not namespace or not offer_id:
+        return None
+    return f"{namespace}:{offer_id}".lower()
+
+
+def _offer_slugs(el: Dict) -> List[str]:
+    """All page slugs an offer is known by, most specific first."""
+    slugs = []
+    mappings = (el.get('offerMappings') or []) + ((el.get('catalogNs') or {}).get('mappings') or [])
+    for mapping in mappings:
+        slugs.append(mapping.get('pageSlug'))
+    slugs.append(el.get('productSlug'))
+    slugs.append(el.get('urlSlug'))
+
+    unique = []
+    for slug in slugs:
+        if not slug or not isinstance(slug, str):
+            continue
+        # productSlug is sometimes "name/home"
+        slug = slug.split('/')[0].strip().lower()
+        if slug and slug not in unique:
+            unique.append(slug)
+    return unique
+
+
+def _cover_image(el: Dict) -> str:
+    images = {img.get('type'): img.get('url') for img in el.get('keyImages') or [] if img.get('url')}
+    for image_type in _IMAGE_TYPES:
+        if images.get(image_type):
+            return images[image_type]
+    return next(iter(images.values()), "")
+
+
+def _original_price(el: Dict) -> str:
+    """Regular (pre-promotion) price as shown by the store, e.g. "$19.99"."""
+    total = (el.get('price') or {}).get('totalPrice') or {}
+    formatted = (total.get('fmtPrice') or {}).get('originalPrice')
+    if formatted and formatted != "0":
+        return formatted
+    amount = total.get('originalPrice')
+    if not amount:
+        return "Unknown"
+    decimals = (total.get('currencyInfo') or {}).get('decimals', 2)
+    return f"{amount / 10 ** decimals:.{decimals}f} {total.get('currencyCode', 'USD')}"
+
+
+def parse_free_games(data: Dict) -> List[Dict]:
+    """Return the currently free offers from a promotions payload.
+
+    Each offer carries its catalog `namespace`/`offer_id`, the canonical
+    `game_id` built from them and every known slug in `aliases`, so history
+    and ownership checks never depend on a single URL segment. Cover art
+    (`image_url`) and the regular price (`price`) travel with the offer into
+    the history record.
+    """
+    games = []
+    elements = data.get('data', {}).get('Catalog', {}).get('searchStore', {}).get('elements', [])
+    for el in elements:
+        promos = el.get('promotions')
+        if not promos: continue
+        offers = promos.get('promotionalOffers', [])
+        if not (offers and offers[0].get('promotionalOffers')):
+            continue
+
+        # Price check (ensure it is actually free)
+        price = el.get('price', {}).get('totalPrice', {}).get('discountPrice', -1)
+        if price != 0:
+            continue
+
+        slugs = _offer_slugs(el)
+        if not slugs:
+            continue
+
+        namespace = el.get('namespace')
+        offer_id = el.get('id')
+        games.append({
+            'name': el.get('title'),
+            'url': STORE_PRODUCT_URL.format(slug=slugs[0]),
+            'slug': slugs[0],
+            'namespace': namespace,
+            'offer_id': offer_id,
+            'game_id': canonical_game_id(namespace, offer_id),
+            'aliases': slugs,
+            'image_url': _cover_image(el),
+            'price': _original_price(el)
+        })
+    return games
+
+
+def fetch_free_games(timeout: int = 15) -> Optional[List[Dict]]:
+    """Fetch the promotions payload over plain HTTP (no browser needed).
+
+    Returns None when the endpoint cannot be reached or parsed, so callers can
+    fall back to the in-browser fetch.
+    """
+    try:
+        response = requests.get(PROMOTIONS_URL, timeout=timeout)
+        response.raise_for_status()
+        return parse_free_games(response.json())
+    except Exception as e:
+        logger.warning(f"   ⚠️ Catalog fetch failed: {e}")
+        return None
@@ -0,0 +1,97 @@
+# Circuit Breaker - stop claiming while an Epic backend is failing for everyone
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .retry import StepFailed
+from src.utils.logger import get_logger
+
+logger = get_logger("breaker")
+
+Key = Tuple[str, str]  # (host, step)
+
+
+class CircuitOpen(StepFailed):
+    """The step's circuit is open: the work is deferred, not failed."""
+
+    def __init__(self, key: Key, retry_in: float):
+        super().__init__(f"{key[0]} '{key[1]}' is failing for all accounts, retry in {retry_in / 60:.0f} min", key[1])
+        self.key = key
+        self.retry_in = retry_in
+
+
+class _Circuit:
+    def __init__(self):
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+
+class CircuitBreaker:
+    """Shared by every account of a claimer, keyed by (host, step).
+
+    `threshold` consecutive failures of the same step (retries exhausted, any
+    account) open its circuit for `cooldown` seconds. After the cooldown one
+    call is let through as a probe: success closes the circuit, failure opens
+    it again. Any success of a step resets its failure count.
+    """
+
+    def __init__(self, threshold: int = 3, cooldown: float = 900):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self._circuits: Dict[Key, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _remaining(self, circuit: _Circuit, now: float) -> float:
+        if circuit.opened_at is None:
+            return 0
+        return max(0.0, circuit.opened_at + self.cooldown - now)
+
+    def check(self, key: Key) -> None:
+        """Raise CircuitOpen unless a call for `key` may go ahead now."""
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            if circuit.opened_at is None:
+                return
+            remaining = self._remaining(circuit, now)
+            if remaining > 0 or circuit.probing:
+                raise CircuitOpen(key, remaining or self.cooldown)
+            # Half-open: this caller is the probe
+            circuit.probing = True
+
+    def record_success(self, key: Key) -> None:
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            if circuit.opened_at is not None:
+                logger.info(f"   🟢 Circuit closed: {key[0]} '{key[1]}' is working again")
+            circuit.failures = 0
+            circuit.opened_at = None
+            circuit.probing = False
+
+    def record_failure(self, key: Key) -> None:
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            circuit.failures += 1
+            if circuit.probing or (circuit.opened_at is None and circuit.failures >= self.threshold):
+                circuit.opened_at = time.monotonic()
+                logger.warning(f"   🔴 Circuit open: {key[0]} '{key[1]}' failed {circuit.failures}x in a row, "
+                               f"pausing it for {self.cooldown / 60:.0f} min")
+            circuit.probing = False
+
+    def release(self, key: Key) -> None:
+        """End a probe that was interrupted without an outcome (cancellation)."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit:
+                circuit.probing = False
+
+    def blocked(self, host: str = None) -> List[CircuitOpen]:
+        """Open circuits (optionally for one host) that are still cooling down."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                CircuitOpen(key, self._remaining(c, now))
+                for key, c in self._circuits.items()
+                if (host is None or key[0] == host) and self._remaining(c, now) > 0
+            ]
@@ -0,0 +1,73 @@
+# Claim Planner - compute the account x offer work matrix once per run
+from typing import Dict, List
+
+from .ownership import OwnershipResolver
+
+
+class ClaimPlan:
+    """Result of planning: which offers each account still needs."""
+
+    def __init__(self, offers: List[Dict]):
+        self.offers = offers
+        self.work: Dict[str, List[Dict]] = {}    # email -> pending offers
+        self.skipped: Dict[str, str] = {}        # email -> reason
+
+    def accounts_to_run(self) -> List[str]:
+        return list(self.work)
+
+    def pending_for(self, email: str) -> List[Dict]:
+        return self.work.get(email, [])
+
+    def report(self) -> str:
+        """Human readable dry-run report."""
+        total = len(self.work) + len(self.skipped)
+        lines = [f"📋 Claim plan: {len(self.offers)} free offer(s), {len(self.work)}/{total} account(s) need work"]
+        for offer in self.offers:
+            lines.append(f"   🎮 {offer.get('name')} [{offer.get('game_id') or offer.get('slug')}]")
+        for email, pending in self.work.items():
+            names = ", ".join(g.get("name", "Unknown") for g in pending)
+            lines.append(f"   ▶️ {email}: {names}")
+
+        reasons: Dict[str, int] = {}
+        for reason in self.skipped.values():
+            reasons[reason] = reasons.get(reason, 0) + 1
+        for reason, count in reasons.items():
+            lines.append(f"   ⏭️ {count} account(s) skipped ({reason})")
+        return "\n".join(lines)
+
+
+class ClaimPlanner:
+    """Decide per account what to claim before any browser is launched.
+
+    Ownership comes from local data only (claim history and titles recorded
+    on the account). The Epic library needs a signed-in browser, which is
+    exactly what planning avoids; games owned on the site but unknown locally
+    are caught later by the store page's "In Library" check.
+    """
+
+    def __init__(self, history):
+        self.history = history
+
+    def build(self, offers: List[Dict], accounts: List[Dict]) -> ClaimPlan:
+        plan = ClaimPlan(offers)
+        claimable = [g for g in offers if g.get("url")]
+
+        for account in accounts:
+            email = account.get("email")
+            if not email:
+                continue
+            if account.get("status") == "disabled":
+                plan.skipped[email] = "disabled"
+                continue
+
+            # Local history + titles recorded on the account from earlier runs
+            ownership = OwnershipResolver()
+            ownership.add_history(self.history, email)
+            ownership.add_titles(account.get("claimed_games", []))
+
+            pending = [g for g in claimable if not ownership.is_owned(g)]
+            if pending:
+                plan.work[email] = pending
+            else:
+                plan.skipped[email] = "nothing new to claim"
+        return plan
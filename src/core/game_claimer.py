@@ -9,11 +9,85 @@
 
 # Game Claimer - claim flow
 import asyncio
-from typing import List, Dict
+from typing import List, Dict, Optional
 from .account_manager import AccountManager
 
-from .epic_drission_connector import EpicDrissionConnector
+from .epic_drission_connector import BrowserKilled, EpicDrissionConnector
+from .async_connector import AsyncDrissionConnector
+from .browser_pool import BrowserPool
+from .circuit_breaker import CircuitBreaker, CircuitOpen
+from .ownership import OwnershipResolver
+from .catalog import fetch_free_games
+from .claim_planner import ClaimPlan, ClaimPlanner
+from src.security.session_validator import SessionStatus, SessionValidator
 from src.utils.claimed_history import ClaimedHistory
+from src.utils.artifacts import get_artifact_writer
+from src.utils.claim_state import ClaimState, ClaimStateStore
+from src.utils.event_bus import get_event_bus
+from src.utils.thumbnails import get_thumbnail_store
+from src.utils.logger import get_logger, log_context
+
+logger = get_logger("claimer")
+
+
+class SessionUnavailable(Exception):
+    """Raised when a browser session could not be opened or signed in."""
+
+    def __init__(self, status: str, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _LazySession:
+    """Browser session for one account, launched and signed in on first use."""
+
+    def __init__(self, claimer: "GameClaimer", email: str, password: str, result: Dict):
+        self.claimer = claimer
+        self.email = email
+        self.password = password
+        self.result = result
+        self.connector = None
+
+    async def acquire(self) -> AsyncDrissionConnector:
+        if self.connector:
+            return self.connector
+
+        # USE DRISSION CONNECTOR BY DEFAULT due to Playwright detection
+        self.connector = AsyncDrissionConnector(
+            EpicDrissionConnector(account_email=self.email, browser_pool=self.claimer.browser_pool,
+                                  breaker=self.claimer.breaker)
+        )
+        self.claimer.active_connectors.append(self.connector)
+
+        # DrissionPage calls run on the connector's own driver thread
+        if not await self.connector.initialize():
+            raise SessionUnavailable("error", "Browser failed to start")
+
+        # login
+        logger.info(f"\n📧 Signing in for {self.email}...")
+        login_success = await self.connector.login(self.email, self.password)
+        if not login_success:
+            raise SessionUnavailable("login_failed", "Login failed or 2FA failed")
+        self.claimer.account_manager.clear_needs_login(self.email)
+
+        # capture real account key detected during login for dedupe
+        if self.connector.last_real_account_key:
+            self.result["real_account_key"] = self.connector.last_real_account_key
+            logger.info(f"ℹ️ Using real account key: {self.connector.last_real_account_key}")
+
+        self.result["cookies_saved"] = True
+        logger.info(f"✅ Cookies saved successfully")
+        return self.connector
+
+    async def close(self):
+        if not self.connector:
+            return
+        try:
+            await self.connector.close()
+            if self.connector in self.claimer.active_connectors:
+                self.claimer.active_connectors.remove(self.connector)
+        except Exception as e:
+            logger.warning(f"⚠️ Cleanup error for {self.email}: {e}")
 
 
 class GameClaimer:
@@ -26,30 +100,52 @@ class GameClaimer:
             self.account_manager = AccountManager()
         self.results = []
         self.history = ClaimedHistory()
+        self.claim_states = ClaimStateStore()   # Checkpoints of in-flight claims
         self.active_connectors = [] # Removed type hint to allow mixed types
+        self.browser_pool = None     # Shared browsers in "context" isolation mode
+        # Shared by all accounts: pauses claim steps that fail for everyone
+        from src.utils.config import ConfigManager
+        config = ConfigManager()
+        self.breaker = CircuitBreaker(
+            threshold=int(config.get("circuit_failure_threshold", 3)),
+            cooldown=float(config.get("circuit_cooldown_minutes", 15)) * 60
+        )
+        # Current run, so Stop/CTRL+C can cancel it from another thread
+        self._run_task = None
+        self._run_loop = None
     
-    async def claim_free_games_for_account(self, email: str) -> Dict:
-        """Claim free games for a single account."""
+    async def claim_free_games_for_account(self, email: str, offers: Optional[List[Dict]] = None) -> Dict:
+        """Claim free games for a single account.
+
+        `offers` is the account's pending work from the claim plan; when omitted
+        the catalog is fetched over HTTP (or through the browser as a last resort).
+        The browser is only launched once a game actually needs claiming.
+        """
+        # Every record logged for this account (driver thread included) carries it
+        events = get_event_bus()
+        with log_context(account=email):
+            events.publish("account", email=email, state="started")
+            result = await self._claim_for_account(email, offers)
+            events.publish("account", email=email, state=result["status"],
+                           claimed=result["claimed_games"], deferred=len(result.get("deferred", [])),
+                           errors=len(result["errors"]))
+            return result
+
+    async def _claim_for_account(self, email: str, offers: Optional[List[Dict]]) -> Dict:
         result = {
             "email": email,
             "status": "pending",
             "free_games": [],
             "claimed_games": [],
             "already_owned": [],
+            "deferred": [],
             "errors": [],
             "cookies_saved": False,
             "real_account_key": email
         }
         
-        connector = None
+        session = None
         try:
-            # USE DRISSION CONNECTOR BY DEFAULT due to Playwright detection
-            connector = EpicDrissionConnector(account_email=email)
-            self.active_connectors.append(connector)
-            
-            # Wrap synchronous DrissionPage calls in to_thread
-            await asyncio.to_thread(connector.initialize)
-            
             # fetch account
             account = self.account_manager.get_account(email)
             if not account:
@@ -59,74 +155,110 @@ class GameClaimer:
             
             # decrypt password
             password = self.account_manager.decrypt_password(account["password"])
+            session = _LazySession(self, email, password, result)
             
-            # login
-            print(f"\n📧 Signing in for {email}...")
-            login_success = await asyncio.to_thread(connector.login, email, password)
-            if not login_success:
-                result["status"] = "login_failed"
-                result["errors"].append("Login failed or 2FA failed")
-                return result
-            
-            # capture real account key detected during login for dedupe
-            if connector.last_real_account_key:
-                result["real_account_key"] = connector.last_real_account_key
-                print(f"ℹ️ Using real account key: {connector.last_real_account_key}")
-
-            result["cookies_saved"] = True
-            print(f"✅ Cookies saved successfully")
-            
-            # fetch free games
-            print(f"🎮 Checking free games...")
-            free_games = await asyncio.to_thread(connector.get_free_games)
+            # fetch free games (already planned offers skip the fetch entirely)
+            free_games = offers
+            if free_games is None:
+                free_games = await asyncio.to_thread(fetch_free_games)
+                self._prewarm_thumbnails(free_games)
+            if free_games is None:
+                connector = await session.acquire()
+                logger.info(f"🎮 Checking free games...")
+                free_games = await connector.get_free_games()
             result["free_games"] = free_games
             
             if not free_games:
-                print(f"⚠️ No games found")
+                logger.warning(f"⚠️ No games found")
                 result["status"] = "success"
                 result["errors"].append("Game list empty")
                 return result
             
-            # check already claimed (site + local history)
-            print(f"📚 Checking previously claimed games...")
-            claimed_games = await asyncio.to_thread(connector.check_claimed_games)
-            result["already_owned"] = claimed_games
+            # re-key slug based history onto catalog ids
+            self.history.migrate_aliases(free_games)
+
+            # Local history first: decides whether a browser is needed at all
+            ownership = OwnershipResolver()
+            ownership.add_history(self.history, email)
+            pending = []
+            for game in free_games:
+                game_name = game.get("name", "Unknown")
+                game_id = game.get("game_id") or self._normalize_game_id(game.get("url", ""), game_name)
+                if ownership.is_owned(game):
+                    logger.info(f"   ℹ️ Already owned/processed: {game_name}")
+                elif self.claim_states.get_state(email, game_id) == ClaimState.CONFIRMED:
+                    # Confirmed in an earlier run that died before writing history
+                    logger.info(f"   ♻️ Recovering confirmed claim: {game_name}")
+                    result["claimed_games"].append(game_name)
+                    self.history.add_claim(game_id, game_name, email,
+                                           image_url=game.get("image_url", ""), price=game.get("price", "Unknown"))
+                    self.claim_states.clear(email, game_id)
+                    ownership.add_game(game)
+                elif not game.get("url"):
+                    logger.warning(f"   ⚠️ Invalid URL: {game_name}")
+                else:
+                    pending.append(game)
+
+            if not pending:
+                logger.info(f"✅ Nothing new to claim for {email} (browser not needed)")
+                result["status"] = "success"
+                return result
+
+            # Backend failing for everyone: don't spend a browser on this account
+            blocked = self.breaker.blocked()
+            if blocked:
+                logger.info(f"⏸️ Deferring {email}: {blocked[0]}")
+                result["deferred"] = [g.get("name", "Unknown") for g in pending]
+                result["status"] = "deferred"
+                result["errors"].append(str(blocked[0]))
+                return result
             
-            # Sort genericly or keep original order
-            free_games_sorted = free_games
+            connector = await session.acquire()
+
+            # check already claimed on the site library
+            logger.info(f"📚 Checking previously claimed games...")
+            claimed_games = await connector.check_claimed_games()
+            result["already_owned"] = claimed_games
+            ownership.add_titles(claimed_games)
             
             # claim new games
-            print(f"🎁 Claiming new games...")
-            for i, game in enumerate(free_games_sorted, 1):
+            logger.info(f"🎁 Claiming new games...")
+            for i, game in enumerate(pending, 1):
                 game_name = game.get("name", "Unknown")
                 game_url = game.get("url", "")
-                game_id = self._normalize_game_id(game_url, game_name)
-
-                # check both Epic library and local history
-                is_already_owned_site = any(game_name.lower() in owned.lower() for owned in claimed_games)
-                is_already_owned_local = self.history.is_claimed(game_id, email)
-
-                if not is_already_owned_site and not is_already_owned_local and game_url:
-                    print(f"\n   [{i}/{len(free_games)}] {game_name}")
-                    print(f"🎁 Claiming game: {game_name}")
-                    try:
-                        claim_success = await asyncio.to_thread(connector.claim_game, game_url, game_name)
-                        if claim_success:
-                            result["claimed_games"].append(game_name)
-                            self.history.add_claim(game_id, game_name, email)
-                            print(f"   ✅ Claimed successfully")
-                        else:
-                            result["errors"].append(f"Failed to claim {game_name}")
-                    except Exception as e:
-                        result["errors"].append(f"Error claiming {game_name}: {e}")
-                    await asyncio.sleep(1)  # small pause between games
-                else:
-                    if is_already_owned_site or is_already_owned_local:
-                        print(f"   ℹ️ Already owned/processed: {game_name}")
+                game_id = game.get("game_id") or self._normalize_game_id(game_url, game_name)
+
+                if ownership.is_owned(game):
+                    logger.info(f"   ℹ️ Already owned/processed: {game_name}")
+                    continue
+
+                logger.info(f"\n   [{i}/{len(pending)}] {game_name}")
+                logger.info(f"🎁 Claiming game: {game_name}")
+                try:
+                    checkpoint = self.claim_states.checkpoint(email, game_id)
+                    claim_success = await connector.claim_game(game_url, game_name, checkpoint)
+                    if claim_success:
+                        result["claimed_games"].append(game_name)
+                        self.history.add_claim(game_id, game_name, email,
+                                               image_url=game.get("image_url", ""), price=game.get("price", "Unknown"))
+                        self.claim_states.clear(email, game_id)
+                        ownership.add_game(game)
+                        logger.info(f"   ✅ Claimed successfully")
                     else:
-                        print(f"   ⚠️ Invalid URL: {game_name}")
+                        result["errors"].append(f"Failed to claim {game_name}")
+                except CircuitOpen as e:
+                    # Leave this and the remaining games to a later run
+                    logger.info(f"   ⏸️ {e}")
+                    result["deferred"] = [g.get("name", "Unknown") for g in pending[i - 1:]]
+                    result["errors"].append(str(e))
+                    break
+                except BrowserKilled:
+                    raise  # No browser left for the remaining games: account ends in "error"
+                except Exception as e:
+                    result["errors"].append(f"Error claiming {game_name}: {e}")
+                await connector.wait(1)  # small pause between games
             
-            result["status"] = "success"
+            result["status"] = "deferred" if result["deferred"] else "success"
             
             # update account status
             self.account_manager.update_account_status(
@@ -134,33 +266,100 @@ class GameClaimer:
                 "active", 
                 claimed_games=result["claimed_games"]
             )
+        
+        except SessionUnavailable as e:
+            result["status"] = e.status
+            result["errors"].append(str(e))
             
         except Exception as e:
             result["status"] = "error"
             result["errors"].append(str(e))
-            print(f"❌ Error occurred: {str(e)}")
+            logger.error(f"❌ Error occurred: {str(e)}")
         
         finally:
-            if connector:
-                try:
-                    connector.close()
-                    if connector in self.active_connectors:
-                        self.active_connectors.remove(connector)
-                except Exception as e:
-                    print(f"⚠️ Cleanup error for {email}: {e}")
+            if session:
+                await session.close()
         
         return result
     
+    async def plan_claims(self, accounts: List[Dict] = None) -> Optional[ClaimPlan]:
+        """Fetch the catalog once and compute the account x offer work matrix.
+
+        Returns None if the catalog could not be fetched over HTTP.
+        """
+        if accounts is None:
+            accounts = self.account_manager.get_all_accounts()
+
+        logger.info("🎮 Fetching free games catalog...")
+        offers = await asyncio.to_thread(fetch_free_games)
+        if offers is None:
+            return None
+        self._prewarm_thumbnails(offers)
+
+        # re-key slug based history onto catalog ids before planning
+        if offers:
+            self.history.migrate_aliases(offers)
+        return ClaimPlanner(self.history).build(offers, accounts)
+
     async def claim_free_games_for_all_accounts(self) -> List[Dict]:
         """Claim free games for all accounts."""
-        print("=" * 50)
-        print("🚀 Epic Games - Auto Claim Started")
-        print("=" * 50)
+        logger.info("=" * 50)
+        logger.info("🚀 Epic Games - Auto Claim Started")
+        logger.info("=" * 50)
         
+        self._run_task = asyncio.current_task()
+        self._run_loop = asyncio.get_running_loop()
+        # One id for this run's log records and its artifacts/<run id>/ folder
+        run_id = get_artifact_writer().begin_run()
+        events = get_event_bus()
+        events.publish("run", run_id=run_id, state="started")
+        state, claimed = "error", 0
+        try:
+            with log_context(run_id=run_id):
+                results = await self._claim_all()
+            state, claimed = "finished", sum(len(r.get("claimed_games", [])) for r in results)
+            return results
+        except asyncio.CancelledError:
+            state = "cancelled"
+            raise
+        finally:
+            self._run_task = None
+            self._run_loop = None
+            events.publish("run", run_id=run_id, state=state, claimed=claimed)
+
+    async def _claim_all(self) -> List[Dict]:
+        artifacts = get_artifact_writer()
         accounts = self.account_manager.get_all_accounts()
+        # Disabled accounts never run, planned or not
+        accounts = [acc for acc in accounts if acc.get("status") != "disabled"]
+
+        # Plan the run before any browser is launched
+        plan = await self.plan_claims(accounts)
+        if plan is not None:
+            logger.info(plan.report())
+            planned = set(plan.accounts_to_run())
+            accounts = [acc for acc in accounts if acc["email"] in planned]
+        else:
+            logger.warning("⚠️ Planning unavailable, falling back to per-account checks.")
+
+        # Flag dead sessions up front instead of burning a browser on each
+        session_statuses = await asyncio.to_thread(self._validate_sessions, accounts)
+        expired_results = []
+        for email, status in session_statuses.items():
+            if status == SessionStatus.EXPIRED:
+                logger.info(f"🔑 Session expired for {email}, flagged for manual re-login.")
+                self.account_manager.update_account_status(email, "needs_login")
+                expired_results.append({
+                    "email": email,
+                    "status": "session_expired",
+                    "claimed_games": [],
+                    "already_owned": [],
+                    "errors": ["Session expired - manual re-login required"]
+                })
+        accounts = [acc for acc in accounts if session_statuses.get(acc["email"]) != SessionStatus.EXPIRED]
         
         # Run accounts sequentially to avoid browser collision and Epic detection
-        print(f"\n🚀 Starting {len(accounts)} account(s) sequentially...\n")
+        logger.info(f"\n🚀 Starting {len(accounts)} account(s) sequentially...\n")
         
         # Execution Mode Config
         from src.utils.config import ConfigManager
@@ -169,10 +368,14 @@ class GameClaimer:
         
         sem_limit = 1
         if exec_mode == "parallel":
-            sem_limit = 3
-            print(f"\n🚀 Starting {len(accounts)} account(s) in PARALLEL mode (Limit: {sem_limit})...")
+            sem_limit = max(1, int(config.get("parallel_accounts", 3)))
+            # "context": accounts share Chromium processes as isolated tabs
+            if config.get("browser_isolation", "process") == "context":
+                self.browser_pool = BrowserPool(config.get("tabs_per_browser", 5))
+            isolation = "shared browser" if self.browser_pool else "browser per account"
+            logger.info(f"\n🚀 Starting {len(accounts)} account(s) in PARALLEL mode (Limit: {sem_limit}, {isolation})...")
         else:
-            print(f"\n🚀 Starting {len(accounts)} account(s) in SEQUENTIAL mode...\n")
+            logger.info(f"\n🚀 Starting {len(accounts)} account(s) in SEQUENTIAL mode...\n")
 
         all_results = []
         sem = asyncio.Semaphore(sem_limit) 
@@ -180,9 +383,10 @@ class GameClaimer:
         async def worker(account):
             async with sem:
                 try:
-                    return await self.claim_free_games_for_account(account["email"])
+                    offers = plan.pending_for(account["email"]) if plan is not None else None
+                    return await self.claim_free_games_for_account(account["email"], offers)
                 except Exception as e:
-                    print(f"❌ Unhandled error for {account['email']}: {e}")
+                    logger.error(f"❌ Unhandled error for {account['email']}: {e}")
                     return {
                         "email": account["email"],
                         "status": "error",
@@ -195,30 +399,37 @@ class GameClaimer:
         tasks = [worker(acc) for acc in accounts]
         
         # Execute
-        if exec_mode == "parallel":
-            # Run concurrently
-            all_results = await asyncio.gather(*tasks)
-        else:
-            # Run strictly sequentially (await one by one)
-            for t in tasks:
-                 all_results.append(await t)
-                 await asyncio.sleep(2) # Brief pause between accounts
+        try:
+            if exec_mode == "parallel":
+                # Run concurrently
+                all_results = await asyncio.gather(*tasks)
+            else:
+                # Run strictly sequentially (await one by one)
+                for t in tasks:
+                     all_results.append(await t)
+                     await asyncio.sleep(2) # Brief pause between accounts
+        finally:
+            if self.browser_pool:
+                self.browser_pool.close_all()
+                self.browser_pool = None
 
         
         # Deduplicate by real account key
         processed_keys = set()
         results = []
-        for result in all_results:
+        for result in list(all_results) + expired_results:
             if isinstance(result, Exception):
-                print(f"❌ Account processing error: {result}")
+                logger.error(f"❌ Account processing error: {result}")
                 continue
             connector_key = result.get("real_account_key") or result.get("email")
             if connector_key in processed_keys:
-                print(f"ℹ️ Skipping duplicate account session for {connector_key}")
+                logger.info(f"ℹ️ Skipping duplicate account session for {connector_key}")
                 continue
             processed_keys.add(connector_key)
             results.append(result)
         
+        await asyncio.to_thread(artifacts.flush)
+
         # show summary
         self._print_results(results)
         self.results = results
@@ -226,37 +437,57 @@ class GameClaimer:
     
     def _print_results(self, results: List[Dict]):
         """Print summary results."""
-        print("\n" + "=" * 50)
-        print("📊 Results")
-        print("=" * 50)
+        logger.info("\n" + "=" * 50)
+        logger.info("📊 Results")
+        logger.info("=" * 50)
         
         total_claimed = 0
         total_errors = 0
         
         for result in results:
-            print(f"\n📧 {result['email']}")
-            print(f"   Status: {result['status']}")
-            print(f"   Claimed: {len(result['claimed_games'])}")
-            print(f"   Already owned: {len(result['already_owned'])}")
-            print(f"   Errors: {len(result['errors'])}")
+            logger.info(f"\n📧 {result['email']}")
+            logger.info(f"   Status: {result['status']}")
+            logger.info(f"   Claimed: {len(result['claimed_games'])}")
+            logger.info(f"   Already owned: {len(result['already_owned'])}")
+            if result.get('deferred'):
+                logger.info(f"   Deferred: {len(result['deferred'])}")
+            logger.info(f"   Errors: {len(result['errors'])}")
             
             if result['claimed_games']:
-                print(f"   ✅ Claimed games:")
+                logger.info(f"   ✅ Claimed games:")
                 for game in result['claimed_games']:
-                    print(f"      - {game}")
+                    logger.info(f"      - {game}")
             
             if result['errors']:
-                print(f"   ❌ Errors:")
+                logger.error(f"   ❌ Errors:")
                 for error in result['errors']:
-                    print(f"      - {error}")
+                    logger.info(f"      - {error}")
             
             total_claimed += len(result['claimed_games'])
             total_errors += len(result['errors'])
         
-        print("\n" + "=" * 50)
-        print(f"📈 Total Claimed: {total_claimed}")
-        print(f"⚠️ Total Errors: {total_errors}")
-        print("=" * 50)
+        logger.info("\n" + "=" * 50)
+        logger.info(f"📈 Total Claimed: {total_claimed}")
+        if total_errors:
+            logger.warning(f"⚠️ Total Errors: {total_errors}")
+        else:
+            logger.info(f"✅ Total Errors: 0")
+        logger.info("=" * 50)
+
+    def _validate_sessions(self, accounts: List[Dict]) -> Dict[str, str]:
+        """HTTP-only check of every stored cookie jar (email -> SessionStatus)."""
+        cookie_manager = self.account_manager.cookie_manager
+        emails = [acc["email"] for acc in accounts if cookie_manager.cookies_exist(acc["email"])]
+        return SessionValidator(cookie_manager).validate_many(emails)
+
+    @staticmethod
+    def _prewarm_thumbnails(offers: Optional[List[Dict]]) -> None:
+        """Cache cover art while claiming, so History never fetches it lazily."""
+        if offers:
+            try:
+                get_thumbnail_store().prewarm(game.get("image_url") for game in offers)
+            except Exception as e:
+                logger.debug(f"Thumbnail pre-warm skipped: {e}")
 
     def _normalize_game_id(self, game_url: str, game_name: str) -> str:
         """Generate a stable game identifier from URL or name."""
@@ -269,11 +500,37 @@ class GameClaimer:
                 return slug.lower()
         return game_name.strip().lower()
 
+    def cancel(self) -> bool:
+        """Thread-safe: cancel the running claim task and interrupt browser waits.
+
+        Each session's `finally` then closes only the browsers this run launched.
+        Returns False if nothing was running.
+        """
+        for connector in list(self.active_connectors):
+            connector.cancel()
+        task, loop = self._run_task, self._run_loop
+        if task is None or loop is None or task.done():
+            return False
+        loop.call_soon_threadsafe(task.cancel)
+        return True
+
+    def shutdown(self):
+        """Synchronous hard stop for signal handlers: cancel, then kill our browser PIDs."""
+        self.cancel()
+        for connector in list(self.active_connectors):
+            try:
+                connector.kill()
+            except Exception:
+                pass
+        if self.browser_pool:
+            self.browser_pool.kill_all()
+
     async def _cleanup_all(self):
         """Force-close all active connectors."""
         for connector in list(self.active_connectors):
             try:
-                connector.close()
+                await connector.close()
             except Exception:
                 pass
-            self.active_connectors.remove(connector)
+            if connector in self.active_connectors:
+                self.active_connectors.remove(connector)
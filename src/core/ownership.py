@@ -0,0 +1,71 @@
+# Ownership Resolver - O(1) "already owned" lookups
+import re
+from typing import Dict, Iterable, Set
+
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_key(value) -> str:
+    """Normalize a slug, title or offer id into a comparable key.
+
+    "Portal 2" and "portal-2" both collapse to "portal-2", while "Portal"
+    stays "portal", so lookups are exact set hits instead of substring scans.
+    """
+    if not value:
+        return ""
+    # Colons separate namespace and offer id, so each part is normalized on its own
+    parts = (_SEPARATORS.sub("-", part).strip("-") for part in str(value).lower().split(":"))
+    return ":".join(part for part in parts if part)
+
+
+def offer_keys(game: Dict) -> Set[str]:
+    """Return every normalized key a catalog entry can be matched by."""
+    keys = set()
+
+    game_id = game.get("game_id")
+    if not game_id and game.get("namespace") and game.get("offer_id"):
+        game_id = f"{game['namespace']}:{game['offer_id']}"
+    if game_id:
+        keys.add(normalize_key(game_id))
+
+    slug = game.get("slug")
+    if not slug and game.get("url"):
+        slug = game["url"].split("?")[0].rstrip("/").split("/")[-1]
+    for value in [slug, game.get("name")] + list(game.get("aliases") or []):
+        key = normalize_key(value)
+        if key:
+            keys.add(key)
+
+    return keys
+
+
+class OwnershipResolver:
+    """Set of normalized keys an account already owns (site library + local history)."""
+
+    def __init__(self):
+        self._keys: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add_titles(self, titles: Iterable[str]) -> None:
+        """Add owned titles/slugs as scraped from the Epic library."""
+        for title in titles or []:
+            key = normalize_key(title)
+            if key:
+                self._keys.add(key)
+
+    def add_game(self, game: Dict) -> None:
+        """Mark a catalog entry as owned (all of its keys)."""
+        self._keys.update(offer_keys(game))
+
+    def add_history(self, history, account_email: str) -> None:
+        """Add every game id (and its recorded title) claimed by the account."""
+        for game_id in history.get_account_claims(account_email):
+            self.add_titles([game_id])
+            record = history.get_claim_record(game_id)
+            if record:
+                self.add_titles([record.get("name")])
+
+    def is_owned(self, game: Dict) -> bool:
+        return not self._keys.isdisjoint(offer_keys(game))
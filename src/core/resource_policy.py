@@ -0,0 +1,99 @@
+# Resource Policy - block heavy resources per page type in claim sessions
+from typing import Dict, List
+from src.utils.logger import get_logger
+
+logger = get_logger("resources")
+
+# Fonts and media are never needed to find a button or verify a price
+_FONTS = ["*.woff2*", "*.woff*", "*.ttf*", "*.otf*"]
+_MEDIA = ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*youtube.com/embed*", "*ytimg.com*"]
+# Epic CDN artwork (hero images, screenshots, thumbnails)
+_EPIC_IMAGES = [
+    "*cdn1.epicgames.com*", "*cdn2.unrealengine.com*",
+    "*epicgames.com/*.jpg*", "*epicgames.com/*.jpeg*", "*epicgames.com/*.png*",
+    "*epicgames.com/*.webp*", "*epicgames.com/*.gif*", "*epicgames.com/*.avif*",
+]
+_TRACKING = ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*"]
+
+_ALL_IMAGES = ["*.jpg*", "*.jpeg*", "*.png*", "*.webp*", "*.gif*", "*.avif*", "*.svg*"]
+
+# Deny lists per page type. Captcha/anti-bot providers load their own images
+# from other hosts, so PDP image blocking is scoped to Epic hosts only.
+PROFILES: Dict[str, List[str]] = {
+    # Store page: hero art, trailers and screenshots are the bulk of the bytes
+    "pdp": _FONTS + _MEDIA + _EPIC_IMAGES + _TRACKING,
+    # Checkout: keep images (payment widgets/challenges), drop the rest
+    "checkout": _FONTS + _MEDIA + _TRACKING,
+    # Account page is only used to verify/harvest the session
+    "account": _FONTS + _MEDIA + _ALL_IMAGES + _TRACKING,
+    # Interactive login may show captcha/2FA challenges: block nothing
+    "login": [],
+}
+
+_MEASURE_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const res = performance.getEntriesByType('resource');
+return {ms: nav ? nav.duration : 0, requests: res.length + 1};
+"""
+
+
+class ResourcePolicy:
+    """Apply a page-type blocking profile over CDP and record what each load cost.
+
+    Cost is load time and request count only: Resource Timing reports a
+    transferSize of 0 for cross-origin responses without Timing-Allow-Origin
+    (most of Epic's CDN), so byte totals from the page would be misleading.
+
+    Blocking uses Network.setBlockedURLs (wildcard deny patterns). Patterns in
+    `allow` are removed from every profile, which is how a blocked resource
+    can be re-enabled from config without touching the profiles.
+    """
+
+    def __init__(self, page, enabled: bool = True, allow: List[str] = None):
+        self.page = page
+        self.enabled = enabled
+        self.allow = set(allow or [])
+        self.current = None
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self._network_enabled = False
+
+    def apply(self, profile: str) -> None:
+        """Switch the deny list to `profile` (no-op if already active)."""
+        if profile == self.current:
+            return
+        self.current = profile
+        if not self.enabled:
+            return
+        try:
+            if not self._network_enabled:
+                self.page.run_cdp('Network.enable')
+                self._network_enabled = True
+            patterns = [p for p in PROFILES.get(profile, []) if p not in self.allow]
+            self.page.run_cdp('Network.setBlockedURLs', urls=patterns)
+        except Exception as e:
+            logger.warning(f"   ⚠️ Resource policy '{profile}' not applied: {e}")
+
+    def measure(self) -> None:
+        """Record load time and request count of the page just loaded."""
+        try:
+            m = self.page.run_js(_MEASURE_JS)
+        except Exception:
+            return
+        if not isinstance(m, dict):
+            return
+        entry = self.stats.setdefault(self.current or "default", {"loads": 0, "ms": 0, "requests": 0})
+        entry["loads"] += 1
+        entry["ms"] += m.get("ms") or 0
+        entry["requests"] += m.get("requests") or 0
+
+    def summary(self) -> str:
+        """One line per profile; compare against a run with resource_blocking off."""
+        mode = "blocking" if self.enabled else "no blocking"
+        lines = []
+        for profile, e in self.stats.items():
+            loads = max(e["loads"], 1)
+            lines.append(
+                f"   📉 [{profile}] {e['loads']} load(s), "
+                f"avg {e['ms'] / loads / 1000:.1f}s, {e['requests']} request(s) ({mode})"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,123 @@
+# Retry Engine - per-step retry policies with backoff and idempotency guards
+import random
+import time
+from typing import Callable, Dict, Optional, Tuple, Type
+from src.utils.logger import get_logger, log_context
+
+logger = get_logger("retry")
+
+
+class StepFailed(Exception):
+    """A claim step failed for good (not retryable, or out of attempts)."""
+
+    def __init__(self, message: str, step: str = None):
+        super().__init__(message)
+        self.step = step
+        self.exhausted = False   # True: still retryable, but out of attempts
+
+
+class TransientStepError(StepFailed):
+    """A claim step failed in a way worth retrying (slow page, missing element...)."""
+
+
+class StepAlreadyAttempted(StepFailed):
+    """A non-idempotent step (e.g. Place Order) was asked to run a second time."""
+
+
+class RetryPolicy:
+    """How one step is retried. `idempotent=False` means it runs at most once, ever."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 2.0, max_delay: float = 20.0,
+                 jitter: float = 0.5, retry_on: Tuple[Type[BaseException], ...] = (TransientStepError,),
+                 idempotent: bool = True):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter            # Fraction of the delay that is randomized
+        self.retry_on = retry_on
+        self.idempotent = idempotent
+
+    def delay(self, attempt: int) -> float:
+        """Backoff before attempt `attempt + 1`: exponential, capped, with jitter."""
+        d = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return d * (1 - self.jitter) + random.uniform(0, d * self.jitter)
+
+
+class RetryEngine:
+    """Run named steps under their policies.
+
+    `fn(attempt)` is called until it returns, raises something not in the
+    policy's `retry_on`, or runs out of attempts (then StepFailed carrying the
+    step name is raised). Steps whose policy is not idempotent are recorded
+    before they run and refuse to run again, whatever their first outcome was.
+
+    With a `breaker`, each step is checked against its (host, step) circuit
+    first, and steps that exhaust their retries count as failures there.
+    """
+
+    def __init__(self, policies: Dict[str, RetryPolicy] = None, sleep: Callable[[float], None] = None,
+                 breaker=None, host: str = ""):
+        self.policies = policies or {}
+        self.sleep = sleep or time.sleep
+        self.breaker = breaker
+        self.host = host
+        self.attempted = set()
+
+    def run(self, step: str, fn: Callable[[int], object], policy: Optional[RetryPolicy] = None):
+        policy = policy or self.policies.get(step) or RetryPolicy()
+
+        if not policy.idempotent and step in self.attempted:
+            raise StepAlreadyAttempted(f"'{step}' already ran once; not repeating it", step)
+
+        if self.breaker is None:
+            return self._attempt(step, fn, policy)
+
+        key = (self.host, step)
+        self.breaker.check(key)
+        try:
+            result = self._attempt(step, fn, policy)
+        except StepFailed as e:
+            # Only exhausted retries say something about the backend's health;
+            # a hard error neither counts against it nor clears it (probe ends)
+            if e.exhausted:
+                self.breaker.record_failure(key)
+            else:
+                self.breaker.release(key)
+            raise
+        except BaseException:
+            self.breaker.release(key)
+            raise
+        self.breaker.record_success(key)
+        return result
+
+    def _attempt(self, step: str, fn: Callable[[int], object], policy: RetryPolicy):
+        if not policy.idempotent:
+            self.attempted.add(step)
+            attempts = 1
+        else:
+            attempts = max(1, policy.max_attempts)
+
+        for attempt in range(1, attempts + 1):
+            try:
+                with log_context(step=step):
+                    return fn(attempt)
+            except StepFailed as e:
+                e.step = e.step or step
+                if not isinstance(e, policy.retry_on):
+                    raise
+                if attempt == attempts:
+                    e.exhausted = True
+                    raise
+                error = e
+            except Exception as e:
+                if not isinstance(e, policy.retry_on):
+                    raise StepFailed(f"{type(e).__name__}: {e}", step) from e
+                if attempt == attempts:
+                    failed = StepFailed(f"{type(e).__name__}: {e}", step)
+                    failed.exhausted = True
+                    raise failed from e
+                error = e
+
+            wait = policy.delay(attempt)
+            logger.info(f"   🔁 {step}: {error} (retry {attempt}/{attempts - 1} in {wait:.1f}s)")
+            self.sleep(wait)
@@ -46,6 +46,9 @@ class GameClaimerApp(ctk.CTk):
         # Show default frame
         self._select_frame("dashboard")
 
+        # Keep cookie jars fresh in the background
+        self.start_cookie_refresher()
+
     def _create_sidebar(self):
         """Create the left sidebar navigation."""
         self.sidebar_frame = ctk.CTkFrame(self, width=200, corner_radius=0)
@@ -127,6 +130,23 @@ class GameClaimerApp(ctk.CTk):
             except Exception as e:
                 print(f"❌ Failed to start Web Dashboard: {e}")
 
+    def start_cookie_refresher(self):
+        if hasattr(self, 'cookie_refresher') and self.cookie_refresher:
+            return
+
+        from src.utils.config import ConfigManager
+        if not ConfigManager().get("cookie_refresh_enabled", True):
+            return
+
+        from src.security.cookie_refresher import CookieRefresher
+        dashboard = self.frames.get("dashboard")
+        # Never compete with a running claim for browsers/bandwidth
+        self.cookie_refresher = CookieRefresher(
+            self.account_manager,
+            is_busy=lambda: getattr(dashboard, "is_running", False)
+        )
+        self.cookie_refresher.start()
+
     def run(self):
         # Handle Close Event for Tray
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -165,6 +185,8 @@ class GameClaimerApp(ctk.CTk):
         """Clean shutdown."""
         if hasattr(self, 'tray') and self.tray:
             self.tray.stop()
+        if hasattr(self, 'cookie_refresher') and self.cookie_refresher:
+            self.cookie_refresher.stop()
         self.quit()
         sys.exit(0)
 
@@ -3,48 +3,74 @@ import customtkinter as ctk
 import sys
 import threading
 import asyncio
+from collections import deque
 from datetime import datetime
+from src.utils.event_bus import get_event_bus
 
 class TextRedirector(object):
+    """stdout/stderr sink for the log widget, safe to write from any thread.
+
+    write() only appends timestamped lines to a bounded ring buffer; the Tk
+    main loop drains it every FLUSH_MS with a single insert, and the widget is
+    trimmed to MAX_LINES so a multi-day pilot run keeps memory flat.
+    """
+
+    FLUSH_MS = 100        # ~10 widget updates per second at most
+    MAX_LINES = 2000      # Lines kept in the widget
+    BUFFER_LINES = 5000   # Lines buffered between two flushes
+
     def __init__(self, widget, tag="stdout"):
         self.widget = widget
         self.tag = tag
+        self._lines = deque(maxlen=self.BUFFER_LINES)
+        self._partial = ""
+        self._dropped = 0
+        self._lock = threading.Lock()
+        # Must be created on the Tk thread; the timer then keeps itself alive
+        self.widget.after(self.FLUSH_MS, self._drain)
 
     def write(self, msg):
-        # Ignore raw newlines usually sent by print() as separate call
-        if msg == "\n":
-            self.widget.configure(state="normal")
-            self.widget.insert("end", "\n")
-            self.widget.configure(state="disabled")
-            return
-            
         if not msg: return
 
         timestamp = datetime.now().strftime("[%H:%M:%S] ")
-        # Prepend timestamp to each line if msg contains internal newlines
-        lines = msg.split('\n')
-        formatted_lines = []
-        for line in lines:
-            if line.strip():
-                formatted_lines.append(f"{timestamp}{line}")
-            else:
-                formatted_lines.append(line)
-        
-        final_msg = '\n'.join(formatted_lines)
-            
-        self.widget.configure(state="normal")
-        self.widget.insert("end", final_msg)
-        self.widget.see("end")
-        self.widget.configure(state="disabled")
-    
+        with self._lock:
+            # print() sends text and its newline as separate writes: keep whole lines
+            text = self._partial + msg
+            *lines, self._partial = text.split('\n')
+            for line in lines:
+                if len(self._lines) == self._lines.maxlen:
+                    self._dropped += 1
+                self._lines.append(f"{timestamp}{line}" if line.strip() else line)
+
     def flush(self):
         pass
 
+    def _drain(self):
+        with self._lock:
+            lines = list(self._lines)
+            self._lines.clear()
+            dropped, self._dropped = self._dropped, 0
+        try:
+            if lines:
+                if dropped:
+                    lines.insert(0, f"... {dropped} line(s) skipped ...")
+                self.widget.configure(state="normal")
+                self.widget.insert("end", "\n".join(lines) + "\n")
+                # Trim from the top once over the limit
+                total = int(self.widget.index("end-1c").split(".")[0])
+                if total > self.MAX_LINES:
+                    self.widget.delete("1.0", f"{total - self.MAX_LINES + 1}.0")
+                self.widget.see("end")
+                self.widget.configure(state="disabled")
+        except Exception:
+            return  # Widget destroyed: stop the timer
+        self.widget.after(self.FLUSH_MS, self._drain)
+
 class DashboardFrame(ctk.CTkFrame):
     def __init__(self, master, claimer):
         super().__init__(master, corner_radius=0, fg_color="transparent")
         self.claimer = claimer
-        self.is_running = False
+        self.is_running = False   # Start/Stop state; set through _set_running()
         self.loop = asyncio.new_event_loop()
         
         # Grid Layout
@@ -125,9 +151,10 @@ class DashboardFrame(ctk.CTkFrame):
         self.console.grid(row=6, column=0, padx=20, pady=(5, 20), sticky="nsew")
         self.console.configure(state="disabled")
 
-        # Redirect stdout and stderr
-        sys.stdout = TextRedirector(self.console, "stdout")
-        sys.stderr = TextRedirector(self.console, "stderr")
+        # Redirect stdout and stderr (one sink keeps their lines in order)
+        redirector = TextRedirector(self.console, "stdout")
+        sys.stdout = redirector
+        sys.stderr = redirector
 
     def toggle_claim(self):
         if not self.is_running:
@@ -135,8 +162,13 @@ class DashboardFrame(ctk.CTkFrame):
         else:
             self.stop_claiming()
 
+    def _set_running(self, running: bool):
+        """Flip the Start/Stop state and tell the web dashboard (status board)."""
+        self.is_running = running
+        get_event_bus().publish("dashboard", running=running)
+
     def start_claiming(self):
-        self.is_running = True
+        self._set_running(True)
         self.btn_start.configure(text="Stop", fg_color="red", hover_color="darkred")
         self.status_label.configure(text="Status: Running...", text_color="green")
         
@@ -144,15 +176,16 @@ class DashboardFrame(ctk.CTkFrame):
         threading.Thread(target=self._run_async_process, daemon=True).start()
 
     def stop_claiming(self):
-        # Graceful stop not fully implemented in CLI backend yet, but we can force state
-        self.is_running = False
+        self._set_running(False)
         self.btn_start.configure(text="Start Claiming", fg_color=['#3B8ED0', '#1F6AA5'], hover_color=['#36719F', '#144870']) # Default blue
         self.status_label.configure(text="Status: Stopping...", text_color="orange")
-        print("\n[GUI] Stopping safely (wait for current task)...")
-        # In a real app we would cancel the asyncio task here
+        print("\n[GUI] Stopping: cancelling claim run and closing its browsers...")
+        # Cancels the asyncio task on its loop thread; sessions close their own browsers
+        self.claimer.cancel()
 
     def toggle_pilot(self):
         """Handle Auto-Pilot toggle."""
+        get_event_bus().publish("dashboard", pilot=bool(self.pilot_var.get()))
         if self.pilot_var.get():
             # Enable Auto-Pilot
             print("\n✈️ Auto-Pilot ENABLED. Hiding window to System Tray...")
@@ -182,8 +215,12 @@ class DashboardFrame(ctk.CTkFrame):
             try:
                 print(f"\n[{datetime.now().strftime('%H:%M')}] ✈️ Pilot: Checking...")
                 
-                # Run the claim process
-                results = self.loop.run_until_complete(self.claimer.claim_free_games_for_all_accounts())
+                # Run the claim process (Stop cancels only this run, not the pilot)
+                try:
+                    results = self.loop.run_until_complete(self.claimer.claim_free_games_for_all_accounts())
+                except asyncio.CancelledError:
+                    print("✈️ Pilot: Current run cancelled.")
+                    results = []
                 
                 # --- SMART PILOT LOGIC ---
                 # Find next unlock time from results
@@ -238,7 +275,16 @@ class DashboardFrame(ctk.CTkFrame):
                     except Exception as e:
                         print(f"⚠️ Timer parse error: {e}")
                 
+                # Claims deferred by the circuit breaker: come back once it cools down
+                if any(res.get("status") == "deferred" for res in results or []):
+                    retry_seconds = int(self.claimer.breaker.cooldown) + 60
+                    if retry_seconds < sleep_seconds:
+                        print("⏸️ Some claims were deferred (Epic backend failing). Retrying after cooldown.")
+                        sleep_seconds = retry_seconds
+
                 print(f"✈️ Pilot: Sleeping for {int(sleep_seconds/60)} minutes...")
+                next_run = datetime.now() + timedelta(seconds=sleep_seconds)
+                get_event_bus().publish("schedule", next_run=next_run.isoformat(timespec="minutes"))
                 
                 # Sleep in chunks to check for disable
                 chunk_size = 60
@@ -255,10 +301,12 @@ class DashboardFrame(ctk.CTkFrame):
         asyncio.set_event_loop(self.loop)
         try:
             self.loop.run_until_complete(self.claimer.claim_free_games_for_all_accounts())
+        except asyncio.CancelledError:
+            print("\n[GUI] Claim run cancelled.")
         except Exception as e:
             print(f"\n[Error] {e}")
         finally:
-            self.is_running = False
+            self._set_running(False)
             # Update UI from main thread if possible, or just via callback
             # Since CustomTkinter isn't perfectly thread-safe, direct config usually works but explicit after() is better.
             # For simplicity in this demo, direct config might work or we rely on user clicking Stop.
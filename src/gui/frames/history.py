@@ -1,46 +1,33 @@
 
 import customtkinter as ctk
-import json
 import os
-import requests
-from io import BytesIO
-from PIL import Image, ImageTk
-from datetime import datetime
-from src.utils.paths import get_data_dir
+import tkinter
+from datetime import datetime, timedelta
 from src.utils.claimed_history import ClaimedHistory
+from src.utils.event_bus import get_event_bus
+from src.gui.thumbnails import ThumbnailLoader
+from src.utils.logger import get_logger
 
-# --- Helper: Async Image Loading ---
-# We can't do full async in Tkinter main thread easily without freezing.
-# We will use a simple caching approach or placeholders.
-# For a polished app, we would use a thread pool to fetch images, then update UI labels.
-
-class ImageCache:
-    _cache = {}
-
-    @classmethod
-    def get_image(cls, url: str, size=(40, 50)):
-        if not url: return None
-        if url in cls._cache:
-            return cls._cache[url]
-        
-        try:
-            response = requests.get(url, timeout=3)
-            if response.status_code == 200:
-                img_data = BytesIO(response.content)
-                pil_img = Image.open(img_data)
-                pil_img = pil_img.resize(size, Image.Resampling.LANCZOS)
-                tk_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=size)
-                cls._cache[url] = tk_img
-                return tk_img
-        except:
-            return None
-        return None
+logger = get_logger("history")
 
 class HistoryFrame(ctk.CTkFrame):
+    EVENT_MS = 500    # How often claim events from this process are drained
+    POLL_MS = 30000   # Fallback: claims written to disk by another process
+
     def __init__(self, master):
         super().__init__(master, corner_radius=0, fg_color="transparent")
         
         self.history_manager = ClaimedHistory()
+        self.thumbnails = ThumbnailLoader(self)
+        # In-memory index: logs oldest first, positions matching the filters
+        self._logs = []
+        self._names = []
+        self._view = []
+        self._total_claims = 0
+        self._total_value = 0.0
+        self._filter_job = None
+        self._history_mtime = None
+        self._claim_events = get_event_bus().subscribe()
         
         # Grid Layout
         self.grid_columnconfigure(0, weight=1)
@@ -57,6 +44,12 @@ class HistoryFrame(ctk.CTkFrame):
 
         # Initial Load
         self._load_data()
+        self.after(self.EVENT_MS, self._drain_claim_events)
+        self.after(self.POLL_MS, self._poll_new_claims)
+
+    def destroy(self):
+        self._claim_events.close()
+        super().destroy()
 
     def _create_stats_header(self):
         """Top cards showing Total Games, Value Saved."""
@@ -103,25 +96,26 @@ class HistoryFrame(ctk.CTkFrame):
         self.toolbar = ctk.CTkFrame(self, fg_color="transparent", height=50)
         self.toolbar.grid(row=1, column=0, padx=20, pady=(0, 10), sticky="ew")
         
-        # Search
+        # Search (filters as you type, debounced)
         self.entry_search = ctk.CTkEntry(self.toolbar, placeholder_text="Search by game title...", width=300)
         self.entry_search.pack(side="left", padx=(0, 10))
-        self.entry_search.bind("<Return>", lambda e: self._load_data())
+        self.entry_search.bind("<KeyRelease>", lambda e: self._schedule_filter())
+        self.entry_search.bind("<Return>", lambda e: self._apply_filters())
         
         # Status Filter
         self.filter_status = ctk.CTkOptionMenu(
             self.toolbar, 
             values=["Status: All", "Status: Success", "Status: Failed"],
-            command=lambda x: self._load_data(),
+            command=lambda x: self._apply_filters(),
             width=140
         )
         self.filter_status.pack(side="left", padx=10)
         
-        # Date Filter (Mockup for now)
+        # Date Filter
         self.filter_date = ctk.CTkOptionMenu(
             self.toolbar,
             values=["Date: All Time", "Date: Last 30 Days", "Date: Today"],
-            command=lambda x: self._load_data(),
+            command=lambda x: self._apply_filters(),
             width=150
         )
         self.filter_date.pack(side="left", padx=10)
@@ -148,132 +142,343 @@ class HistoryFrame(ctk.CTkFrame):
         self.headers_frame.grid_columnconfigure(3, minsize=100)
         self.headers_frame.grid_columnconfigure(4, minsize=100)
 
-        # Content (Scrollable)
-        self.scroll_frame = ctk.CTkScrollableFrame(self, fg_color="transparent")
-        self.scroll_frame.grid(row=3, column=0, padx=20, pady=(5, 20), sticky="nsew")
-        
-        self.scroll_frame.grid_columnconfigure(1, weight=1)
-        self.scroll_frame.grid_columnconfigure(2, minsize=150)
-        self.scroll_frame.grid_columnconfigure(3, minsize=100)
-        self.scroll_frame.grid_columnconfigure(4, minsize=100)
+        # Content: a fixed pool of row widgets over a scrollable index (virtualized)
+        self.table = HistoryTable(self, self.thumbnails)
+        self.table.grid(row=3, column=0, padx=20, pady=(5, 20), sticky="nsew")
         
         # Make row 3 expand
         self.grid_rowconfigure(3, weight=1) 
         self.grid_rowconfigure(2, weight=0) # Headers fixed
 
+    # --- Data ---
+
     def _load_data(self):
-        # 1. Clear Table
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
+        """Full reload from disk (Refresh button / first open)."""
+        mtime = self._file_mtime()
+        # Reload from disk; on a half-written file the next poll tries again
+        self._history_mtime = mtime if self.history_manager.reload() else None
+        # Stored newest first; the index is kept oldest first so new claims append
+        self._logs = list(reversed(self.history_manager.get_recent_logs()))
+        self._names = [log.get("game_name", "Unknown").lower() for log in self._logs]
+        self._apply_filters()
 
-        # 2. Fetch Data
-        self.history_manager._load() # Reload from disk
-        logs = self.history_manager.get_recent_logs()
-        
-        # 3. Filter
-        query = self.entry_search.get().lower()
+    def _file_mtime(self):
+        try:
+            return os.path.getmtime(self.history_manager.path)
+        except OSError:
+            return None
+
+    def _drain_claim_events(self):
+        """Append claims published on the event bus (runs on the Tk thread)."""
+        new = []
+        while True:
+            event = self._claim_events.get(timeout=0)
+            if event is None:
+                break
+            if event["type"] == "claim":
+                new.append(event["data"])
+        last_ts = self._logs[-1].get("timestamp", 0) if self._logs else 0
+        new = [log for log in new if log.get("timestamp", 0) > last_ts]
+        for log in new:
+            self._append_log(log)
+        if new:
+            self._refresh_view()
+        self.after(self.EVENT_MS, self._drain_claim_events)
+
+    def _poll_new_claims(self):
+        """Pick up claims another process wrote to disk without rebuilding anything."""
+        try:
+            mtime = self._file_mtime()
+            if mtime != self._history_mtime:
+                if not self.history_manager.reload():
+                    # Probably caught mid-write: keep the old mtime and retry next poll
+                    logger.debug("History file not readable yet, retrying")
+                else:
+                    self._history_mtime = mtime
+                    self._merge_new_claims()
+        except Exception as e:
+            logger.debug(f"History poll failed, reloading: {e}")
+            try:
+                self._load_data()
+            except Exception as e:
+                logger.debug(f"History reload failed: {e}")
+        self.after(self.POLL_MS, self._poll_new_claims)
+
+    def _merge_new_claims(self):
+        stored = self.history_manager.get_recent_logs()
+        last_ts = self._logs[-1].get("timestamp", 0) if self._logs else 0
+        new = [log for log in stored if log.get("timestamp", 0) > last_ts]
+        if len(stored) < len(self._logs) + len(new):
+            # Oldest entries were rotated out: cheaper to start over
+            self._load_data()
+        else:
+            for log in reversed(new):
+                self._append_log(log)
+            if new:
+                self._refresh_view()
+
+    def _append_log(self, log):
+        index = len(self._logs)
+        self._logs.append(log)
+        self._names.append(log.get("game_name", "Unknown").lower())
+        if self._matching_names is not None and self._query in self._names[index]:
+            self._matching_names.add(self._names[index])
+        if self._matches(index):
+            self._view.append(index)
+            self._count_stats(index)
+
+    # --- Filtering ---
+
+    def _schedule_filter(self):
+        if self._filter_job:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(150, self._apply_filters)
+
+    def _read_filters(self):
+        self._query = self.entry_search.get().strip().lower()
+        # Name index lookup instead of a substring test per log
+        self._matching_names = self.history_manager.search_names(self._query) if self._query else None
         status_filter = self.filter_status.get()
+        self._status = "Success" if "Success" in status_filter else "Failed" if "Failed" in status_filter else None
         date_filter = self.filter_date.get()
-        
-        filtered = []
-        total_claims = 0
-        total_value = 0.0
-        
-        for log in logs:
-            name = log.get("game_name", "Unknown")
-            status = log.get("status", "Success")
-            price_str = log.get("price", "Unknown")
-            
-            # Text Search
-            if query and query not in name.lower(): continue
-            
-            # Status Filter
-            if "Success" in status_filter and status != "Success": continue
-            if "Failed" in status_filter and status != "Failed": continue
-            
-            # Date Filter (Basic Implementation)
-            # You can parse log['date'] and compare delta
-            
-            filtered.append(log)
-            
-            # Calc Stats (Naive)
-            if status == "Success":
-                total_claims += 1
-                try:
-                    # Clean price string: "$29.99" -> 29.99
-                    clean = price_str.replace("$", "").replace("₺", "").replace("TRY", "").replace("Free", "0").strip()
-                    val = float(clean)
-                    total_value += val
-                except: pass
-
-        # 4. Render Rows
-        if not filtered:
-             ctk.CTkLabel(self.scroll_frame, text="No records found matching filters.", text_color="gray").pack(pady=20)
+        # Whole days, so the header stats can come from the per-day aggregates
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        span = 1 if "Today" in date_filter else 30 if "30" in date_filter else None
+        if span:
+            first = today - timedelta(days=span - 1)
+            self._since = first.timestamp()
+            self._days = [(first + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(span)]
         else:
-            for i, log in enumerate(filtered):
-                self._draw_row(i, log)
-        
-        # 5. Update Top Stats
-        self._update_stat_card(self.card_total, str(total_claims))
-        self._update_stat_card(self.card_value, f"${total_value:.2f}")
-
-    def _draw_row(self, index, log):
-        # Row Frame (For styling background)
-        # We draw directly to grid for performance, but background striping is tricky in pure grid.
-        # We'll use a frame per row.
-        row_color = ("gray90", "gray17") if index % 2 == 0 else "transparent"
-        row_frame = ctk.CTkFrame(self.scroll_frame, fg_color=row_color, corner_radius=6, height=60)
-        row_frame.grid(row=index, column=0, columnspan=5, sticky="ew", pady=2)
-        
+            self._since = None
+            self._days = None
+
+    def _matches(self, index) -> bool:
+        log = self._logs[index]
+        if self._matching_names is not None and self._names[index] not in self._matching_names:
+            return False
+        if self._status and log.get("status", "Success") != self._status:
+            return False
+        if self._since is not None and log.get("timestamp", 0) < self._since:
+            return False
+        return True
+
+    def _count_stats(self, index):
+        # Only a text search needs per-row sums; otherwise _refresh_view reads the aggregates
+        if self._query and self._logs[index].get("status", "Success") == "Success":
+            self._total_claims += 1
+            self._total_value += self._logs[index].get("price_value", 0.0)
+
+    def _apply_filters(self):
+        """Rebuild the filtered index (plain list work, no widgets) and redraw."""
+        self._filter_job = None
+        self._read_filters()
+        self._total_claims = 0
+        self._total_value = 0.0
+        self._view = []
+        for i in range(len(self._logs)):
+            if self._matches(i):
+                self._view.append(i)
+                self._count_stats(i)
+        self.table.scroll_to_top()
+        self._refresh_view()
+
+    def _refresh_view(self):
+        logs, view = self._logs, self._view
+        if not self._query:
+            if self._status == "Failed":
+                stats = {"count": 0, "value": 0.0}
+            else:
+                stats = self.history_manager.get_stats(status="Success", days=self._days)
+            self._total_claims, self._total_value = stats["count"], stats["value"]
+        # Newest first: position 0 is the last index in the view
+        self.table.set_source(len(view), lambda pos: logs[view[len(view) - 1 - pos]])
+        self._update_stat_card(self.card_total, str(self._total_claims))
+        self._update_stat_card(self.card_value, f"${self._total_value:.2f}")
+
+
+class _HistoryRow(ctk.CTkFrame):
+    """One recyclable table row; bind() swaps in another log entry."""
+
+    def __init__(self, master, thumbnails):
+        super().__init__(master, corner_radius=6, height=HistoryTable.ROW_HEIGHT)
+        self.thumbnails = thumbnails
+        self.grid_propagate(False)
+
         # Configure internal grid of row_frame matches parent headers
-        row_frame.grid_columnconfigure(1, weight=1)
-        row_frame.grid_columnconfigure(2, minsize=150)
-        row_frame.grid_columnconfigure(3, minsize=100)
-        row_frame.grid_columnconfigure(4, minsize=100)
-
-        # 1. Image (Placeholder or Cached)
-        # Using a fixed placeholder color frame if no image
-        img_url = log.get("image_url")
-        
-        try:
-            # Placeholder Box
-            img_box = ctk.CTkFrame(row_frame, width=40, height=50, fg_color="gray30")
-            img_box.grid(row=0, column=0, padx=(10, 5), pady=5)
-            
-            # Ideally load image here. For now, simple icon or text
-            ctk.CTkLabel(img_box, text="IMG", font=("Arial", 8)).place(relx=0.5, rely=0.5, anchor="center")
-            
-        except: pass
+        self.grid_columnconfigure(1, weight=1)
+        self.grid_columnconfigure(2, minsize=150)
+        self.grid_columnconfigure(3, minsize=100)
+        self.grid_columnconfigure(4, minsize=100)
+        self.grid_rowconfigure(0, weight=1)
+
+        # 1. Cover art ("IMG" placeholder until it loads)
+        self.img_box = ctk.CTkFrame(self, width=40, height=50, fg_color="gray30")
+        self.img_box.grid(row=0, column=0, padx=(10, 5), pady=5)
+        self.img_label = ctk.CTkLabel(self.img_box, text="IMG", font=("Arial", 8))
+        self.img_label.place(relx=0.5, rely=0.5, anchor="center")
+        # Placed over the placeholder once loaded (CTkLabel can't reliably drop an image again)
+        self.img_art = ctk.CTkLabel(self.img_box, text="")
 
         # 2. Title & Source
-        title_frame = ctk.CTkFrame(row_frame, fg_color="transparent")
+        title_frame = ctk.CTkFrame(self, fg_color="transparent")
         title_frame.grid(row=0, column=1, padx=10, sticky="w")
-        
-        ctk.CTkLabel(title_frame, text=log.get("game_name"), font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w")
-        source = log.get("source", "Epic Games Store")
-        ctk.CTkLabel(title_frame, text=source, font=ctk.CTkFont(size=11), text_color="gray").pack(anchor="w")
+        self.lbl_title = ctk.CTkLabel(title_frame, text="", font=ctk.CTkFont(size=14, weight="bold"))
+        self.lbl_title.pack(anchor="w")
+        self.lbl_source = ctk.CTkLabel(title_frame, text="", font=ctk.CTkFont(size=11), text_color="gray")
+        self.lbl_source.pack(anchor="w")
 
         # 3. Date
-        date_str = log.get("date", "")
-        # Try to make multiline: Date \n Time
-        try:
-            parts = date_str.split(" ")
-            if len(parts) >= 2:
-                final_date = f"{parts[0]}\n{parts[1]}"
-            else:
-                final_date = date_str
-        except: final_date = date_str
-        
-        ctk.CTkLabel(row_frame, text=final_date, font=ctk.CTkFont(size=12), justify="left").grid(row=0, column=2, padx=10, sticky="w")
+        self.lbl_date = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=12), justify="left")
+        self.lbl_date.grid(row=0, column=2, padx=10, sticky="w")
 
         # 4. Status Pill
-        status = log.get("status", "Success")
-        color = "#2ECC71" if status == "Success" else "#E74C3C" # Green / Red
-        
-        pill = ctk.CTkFrame(row_frame, fg_color=color, corner_radius=12, height=24)
-        pill.grid(row=0, column=3, padx=10, sticky="w")
-        ctk.CTkLabel(pill, text=status, font=ctk.CTkFont(size=11, weight="bold"), text_color="white").pack(padx=10, pady=2)
+        self.pill = ctk.CTkFrame(self, corner_radius=12, height=24)
+        self.pill.grid(row=0, column=3, padx=10, sticky="w")
+        self.lbl_status = ctk.CTkLabel(self.pill, text="", font=ctk.CTkFont(size=11, weight="bold"), text_color="white")
+        self.lbl_status.pack(padx=10, pady=2)
 
         # 5. Price
-        price = log.get("price", "Unknown")
-        ctk.CTkLabel(row_frame, text=price, font=ctk.CTkFont(size=13, weight="bold")).grid(row=0, column=4, padx=10, sticky="e")
+        self.lbl_price = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=13, weight="bold"))
+        self.lbl_price.grid(row=0, column=4, padx=10, sticky="e")
+        self._log = None
+        self._color = None
+        self._image_url = None
+
+    def bind_log(self, index, log):
+        row_color = ("gray90", "gray17") if index % 2 == 0 else "transparent"
+        if log is self._log and row_color == self._color:
+            return  # Already showing this entry
+        self._log, self._color = log, row_color
+        self.configure(fg_color=row_color)
+
+        self.lbl_title.configure(text=log.get("game_name"))
+        self.lbl_source.configure(text=log.get("source", "Epic Games Store"))
+
+        # Date \n Time
+        date_str = log.get("date", "")
+        parts = date_str.split(" ")
+        self.lbl_date.configure(text=f"{parts[0]}\n{parts[1]}" if len(parts) >= 2 else date_str)
+
+        status = log.get("status", "Success")
+        self.pill.configure(fg_color="#2ECC71" if status == "Success" else "#E74C3C") # Green / Red
+        self.lbl_status.configure(text=status)
+        self.lbl_price.configure(text=log.get("price", "Unknown"))
+
+        url = log.get("image_url") or None
+        if url != self._image_url:
+            self._image_url = url
+            self.img_art.place_forget()
+            if url:
+                self.thumbnails.request(url, lambda image, u=url: self._show_image(u, image))
+
+    def _show_image(self, url, image):
+        # The row may have been rebound to another log while the image loaded
+        if image is not None and url == self._image_url:
+            self.img_art.configure(image=image)
+            self.img_art.place(relx=0.5, rely=0.5, anchor="center")
+
+
+class HistoryTable(ctk.CTkFrame):
+    """Virtualized list: only the rows that fit on screen exist as widgets.
+
+    The data is a (count, get(position)) source. Scrolling moves an offset and
+    rebinds the same row widgets, so cost depends on the viewport height, not
+    on how many records the history holds.
+    """
+
+    ROW_HEIGHT = 64
+
+    def __init__(self, master, thumbnails):
+        super().__init__(master, fg_color="transparent")
+        self.thumbnails = thumbnails
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.grid(row=0, column=0, sticky="nsew")
+        self.viewport.grid_columnconfigure(0, weight=1)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.empty_label = ctk.CTkLabel(self.viewport, text="No records found matching filters.", text_color="gray")
+
+        self._rows = []
+        self._count = 0
+        self._get = None
+        self._offset = 0
+        self._visible = 0
+
+        self.viewport.bind("<Configure>", self._on_resize)
+        # Wheel events go to the widget under the pointer; no app-wide bind_all,
+        # which would clobber the scrollable frames on other pages
+        self._bind_wheel(self)
+
+    def set_source(self, count, get):
+        self._count = count
+        self._get = get
+        self._offset = max(0, min(self._offset, count - self._visible))
+        self._render()
+
+    def scroll_to_top(self):
+        self._offset = 0
+
+    def _on_resize(self, event):
+        visible = max(1, event.height // self.ROW_HEIGHT)
+        if visible != self._visible:
+            self._visible = visible
+            self._render()
+
+    def _bind_wheel(self, widget):
+        """Scroll on wheel over `widget` and everything inside it (CTk's inner canvases too)."""
+        # Plain Tk bind per Tk widget: CTk's bind() would also forward to its canvas and fire twice
+        tkinter.Misc.bind(widget, "<MouseWheel>", lambda e: self._scroll_by(-1 if e.delta > 0 else 1), "+")
+        tkinter.Misc.bind(widget, "<Button-4>", lambda e: self._scroll_by(-1), "+")
+        tkinter.Misc.bind(widget, "<Button-5>", lambda e: self._scroll_by(1), "+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    def _scroll_by(self, rows):
+        self._scroll_to(self._offset + rows * 3)
+
+    def _scroll_to(self, offset):
+        offset = max(0, min(int(offset), self._count - self._visible))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * self._count)
+        elif args[0] == "scroll":
+            step = self._visible if args[2] == "pages" else 1
+            self._scroll_to(self._offset + int(args[1]) * step)
+
+    def _render(self):
+        if self._get is None:
+            return
+        shown = min(self._visible, self._count - self._offset)
+
+        # Grow the pool lazily; never more rows than fit on screen
+        while len(self._rows) < shown:
+            row = _HistoryRow(self.viewport, self.thumbnails)
+            self._bind_wheel(row)
+            self._rows.append(row)
+
+        for i, row in enumerate(self._rows):
+            if i < shown:
+                position = self._offset + i
+                row.bind_log(position, self._get(position))
+                row.grid(row=i, column=0, sticky="ew", pady=2)
+            else:
+                row.grid_remove()
+
+        if self._count:
+            self.empty_label.grid_remove()
+        else:
+            self.empty_label.grid(row=0, column=0, pady=20)
+
+        if self._count:
+            first = self._offset / self._count
+            last = min(1.0, (self._offset + self._visible) / self._count)
+        else:
+            first, last = 0.0, 1.0
+        self.scrollbar.set(first, last)
@@ -180,8 +180,14 @@ class SettingsFrame(ctk.CTkFrame):
             if days_left != -1 and days_left < 3:
                 expiry_text = f" (⚠️ Expires in {days_left} days)"
                 
+            needs_login = (status == "needs_login")
+            if needs_login:
+                expiry_text = " (🔑 Session expired - re-login required)"
+                
             cb = ctk.CTkCheckBox(row, text=f"{email}{expiry_text}", variable=var, onvalue=1, offvalue=0)
-            if expiry_text:
+            if needs_login:
+                cb.configure(text_color="#E74C3C")
+            elif expiry_text:
                 cb.configure(text_color="orange")
             cb.pack(side="left", padx=10, pady=5)
             
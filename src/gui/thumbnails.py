@@ -0,0 +1,102 @@
+# Thumbnails - cover art for the GUI, loaded off the Tk thread
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import customtkinter as ctk
+
+from src.utils.thumbnails import HISTORY_SIZE, get_thumbnail_store
+
+Size = Tuple[int, int]
+
+
+class ThumbnailLoader:
+    """Async CTkImage loader with an LRU bounded by decoded bytes.
+
+    request() answers from memory right away, otherwise a small worker pool
+    reads the disk cache or downloads the image. Workers only produce PIL
+    images; the CTkImage is created and callbacks run on the Tk thread, which
+    drains finished loads every POLL_MS. Concurrent requests for the same URL
+    share one load.
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, widget, size: Size = HISTORY_SIZE, display_size: Size = (40, 50),
+                 max_bytes: int = 16 * 1024 * 1024, workers: int = 4):
+        self.widget = widget
+        self.size = size                  # Stored/decoded resolution (2x for HiDPI)
+        self.display_size = display_size  # Size the widgets show
+        self.max_bytes = max_bytes
+        self.store = get_thumbnail_store()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnail")
+        self._images: "OrderedDict[str, Tuple[ctk.CTkImage, int]]" = OrderedDict()
+        self._bytes = 0
+        self._pending: Dict[str, List[Callable]] = {}
+        self._done: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._failed = set()
+        self._polling = False
+        self._pool.submit(self.store.prune)
+
+    def request(self, url: str, callback: Callable[[Optional[ctk.CTkImage]], None]) -> None:
+        """Deliver the image for `url` to `callback` (on the Tk thread)."""
+        if not url or url in self._failed:
+            callback(None)
+            return
+        cached = self._images.get(url)
+        if cached:
+            self._images.move_to_end(url)
+            callback(cached[0])
+            return
+        if url in self._pending:
+            self._pending[url].append(callback)
+            return
+        self._pending[url] = [callback]
+        self._pool.submit(self._load, url)
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.POLL_MS, self._drain)
+
+    def _load(self, url: str):
+        try:
+            img = self.store.load(url, self.size)
+        except Exception:
+            img = None
+        self._done.put((url, img))
+
+    def _drain(self):
+        while True:
+            try:
+                url, img = self._done.get_nowait()
+            except queue.Empty:
+                break
+            image = self._remember(url, img) if img is not None else None
+            if image is None:
+                self._failed.add(url)
+            for callback in self._pending.pop(url, []):
+                try:
+                    callback(image)
+                except Exception:
+                    pass  # Row widget destroyed meanwhile
+
+        if self._pending:
+            try:
+                self.widget.after(self.POLL_MS, self._drain)
+                return
+            except Exception:
+                pass  # Widget destroyed: stop polling
+        self._polling = False
+
+    def _remember(self, url: str, img) -> ctk.CTkImage:
+        image = ctk.CTkImage(light_image=img, dark_image=img, size=self.display_size)
+        cost = img.width * img.height * len(img.getbands())
+        self._images[url] = (image, cost)
+        self._bytes += cost
+        while self._bytes > self.max_bytes and len(self._images) > 1:
+            _, (_, evicted) = self._images.popitem(last=False)
+            self._bytes -= evicted
+        return image
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -23,12 +23,12 @@ def _cleanup_on_interrupt(signum, frame):
     """Handle CTRL+C gracefully."""
     print("\n\n⚠️ Bot interrupted by user (CTRL+C)...")
     print("🔒 Closing browsers...")
-    try:
-        import subprocess
-        subprocess.run(["taskkill", "/F", "/IM", "chrome.exe"], 
-                      capture_output=True, timeout=5)
-    except Exception:
-        pass
+    # Only the browsers this process launched (tracked by PID), never other Chrome windows
+    if _current_claimer:
+        try:
+            _current_claimer.shutdown()
+        except Exception:
+            pass
     print("👋 Goodbye!")
     sys.exit(0)
 
@@ -44,11 +44,23 @@ async def claim_games_console():
         print("❌ No accounts added. Please use the GUI to add accounts first.")
         return
 
+    global _current_claimer
     print(f"\n✨ Will claim games for {len(accounts)} account(s)...")
     claimer = GameClaimer()
+    _current_claimer = claimer
     await claimer.claim_free_games_for_all_accounts()
 
 
+async def dry_run_console():
+    """Print the claim plan without launching any browser."""
+    claimer = GameClaimer()
+    plan = await claimer.plan_claims()
+    if plan is None:
+        print("❌ Could not fetch the free games catalog.")
+        return
+    print(plan.report())
+
+
 def open_gui():
     """Launch the GUI interface."""
     try:
@@ -56,7 +68,9 @@ def open_gui():
         import customtkinter
         from src.gui.app import GameClaimerApp
 
+        global _current_claimer
         app = GameClaimerApp()
+        _current_claimer = app.claimer
         app.run()
     except ImportError as e:
         print("\n❌ Missing dependencies for GUI.")
@@ -75,6 +89,7 @@ def main():
     """Entry point with optional auto/registration flags."""
     parser = argparse.ArgumentParser(description="EpicAuto Collector")
     parser.add_argument("--auto", action="store_true", help="Silent mode: claim and exit")
+    parser.add_argument("--dry-run", action="store_true", help="Print the claim plan and exit")
     parser.add_argument("--register-auto", action="store_true", help="Add startup Task Scheduler job")
     parser.add_argument("--unregister-auto", action="store_true", help="Remove startup Task Scheduler job")
     parser.add_argument("--task-name", default="EpicAutoCollector", help="Task Scheduler task name")
@@ -85,6 +100,11 @@ def main():
         asyncio.run(claim_games_console())
         return
 
+    # Dry-run: show which accounts would claim what
+    if args.dry_run:
+        asyncio.run(dry_run_console())
+        return
+
     # Register/unregister startup tasks
     exe_path = sys.executable
     script_cmd = f"{exe_path} -m src.main --auto"
@@ -1,20 +1,28 @@
 # Cookie Manager - cookie management
+import hashlib
 import json
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
 from src.utils.paths import get_data_dir
+from src.utils.logger import get_logger
+
+logger = get_logger("cookies")
 
 
 class CookieManager:
     """Store and manage cookies."""
     
+    SESSION_DAYS = 30
+    # Unchanged jars are only rewritten to extend expires_at once inside this margin
+    EXPIRY_BUMP_MARGIN = timedelta(days=7)
+    
     def __init__(self, cookies_dir: str = None):
         if cookies_dir is None:
             cookies_dir = os.path.join(get_data_dir(), "cookies")
         self.cookies_dir = cookies_dir
         os.makedirs(self.cookies_dir, exist_ok=True)
-        print(f"📁 Cookie storage: {self.cookies_dir}")
+        logger.info(f"📁 Cookie storage: {self.cookies_dir}")
     
     def _get_cookie_file(self, email: str) -> str:
         """Return cookie file path for email."""
@@ -23,24 +31,84 @@ class CookieManager:
         path = os.path.join(self.cookies_dir, f"{safe_email}_cookies.json")
         return path
     
+    @staticmethod
+    def _jar_hash(cookies: list) -> str:
+        """Order-independent hash of the cookie jar contents."""
+        normalized = sorted(
+            (str(c.get('name')), str(c.get('value')), str(c.get('domain', '')),
+             str(c.get('path', '/')), bool(c.get('secure', True)))
+            for c in cookies if isinstance(c, dict)
+        )
+        return hashlib.sha256(json.dumps(normalized).encode()).hexdigest()
+
+    @staticmethod
+    def _read_cookie_file(cookie_file: str) -> dict | None:
+        if not os.path.exists(cookie_file):
+            return None
+        try:
+            with open(cookie_file, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return None
+
     def save_cookies(self, email: str, cookies: list) -> bool:
-        """Persist cookies to disk."""
+        """Persist cookies to disk.
+
+        An identical jar is not rewritten (unless its expiry needs extending);
+        real changes bump the per-account `change_count`.
+        """
         try:
             cookie_file = self._get_cookie_file(email)
+            jar_hash = self._jar_hash(cookies)
+            now = datetime.now()
+            
+            existing = self._read_cookie_file(cookie_file)
+            changed = True
+            change_count = 0
+            if existing and existing.get("email") == email:
+                old_hash = existing.get("jar_hash") or self._jar_hash(existing.get("cookies", []))
+                changed = (old_hash != jar_hash)
+                change_count = existing.get("change_count", 0)
+                if not changed:
+                    try:
+                        expires_at = datetime.fromisoformat(existing["expires_at"])
+                        if expires_at - now > self.EXPIRY_BUMP_MARGIN:
+                            return True
+                    except Exception:
+                        pass
+            
             cookie_data = {
                 "email": email,
                 "cookies": cookies,
-                "saved_at": datetime.now().isoformat(),
-                "expires_at": (datetime.now() + timedelta(days=30)).isoformat()
+                "saved_at": now.isoformat(),
+                "expires_at": (now + timedelta(days=self.SESSION_DAYS)).isoformat(),
+                "jar_hash": jar_hash,
+                "change_count": change_count + (1 if changed else 0)
             }
             
             with open(cookie_file, 'w') as f:
                 json.dump(cookie_data, f, indent=4)
             
-            print(f"✅ Cookies saved for {email} to: {cookie_file}")
+            if changed:
+                logger.info(f"✅ Cookies saved for {email} to: {cookie_file}")
             return True
         except Exception as e:
-            print(f"❌ Cookies save failed: {str(e)}")
+            logger.error(f"❌ Cookies save failed: {str(e)}")
+            return False
+
+    def touch(self, email: str) -> bool:
+        """Extend expires_at of an existing jar without touching its cookies."""
+        cookie_file = self._get_cookie_file(email)
+        data = self._read_cookie_file(cookie_file)
+        if not data:
+            return False
+        try:
+            data["expires_at"] = (datetime.now() + timedelta(days=self.SESSION_DAYS)).isoformat()
+            with open(cookie_file, 'w') as f:
+                json.dump(data, f, indent=4)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Cookies touch failed: {str(e)}")
             return False
     
     def load_cookies(self, email: str) -> list | None:
@@ -56,28 +124,28 @@ class CookieManager:
                 if os.path.exists(alt_file):
                     cookie_file = alt_file
                 else:
-                    print(f"ℹ️ Cookies file not found: {email}")
+                    logger.info(f"ℹ️ Cookies file not found: {email}")
                     return None
             else:
-                print(f"ℹ️ Cookies file not found: {email}")
+                logger.info(f"ℹ️ Cookies file not found: {email}")
                 return None
         try:
-            print(f"📂 Loading cookies from: {cookie_file}")
+            logger.info(f"📂 Loading cookies from: {cookie_file}")
             with open(cookie_file, 'r') as f:
                 cookie_data = json.load(f)
             
             # check expiry
             expires_at = datetime.fromisoformat(cookie_data["expires_at"])
             if datetime.now() > expires_at:
-                print(f"⚠️ Cookies expired: {email}")
+                logger.warning(f"⚠️ Cookies expired: {email}")
                 os.remove(cookie_file)
                 return None
             
-            print(f"✅ Cookies loaded: {email}")
+            logger.info(f"✅ Cookies loaded: {email}")
             return cookie_data["cookies"]
         
         except Exception as e:
-            print(f"❌ Error loading cookies: {str(e)}")
+            logger.error(f"❌ Error loading cookies: {str(e)}")
             return None
     
     def delete_cookies(self, email: str) -> bool:
@@ -86,11 +154,11 @@ class CookieManager:
             cookie_file = self._get_cookie_file(email)
             if os.path.exists(cookie_file):
                 os.remove(cookie_file)
-                print(f"✅ Cookies deleted: {email}")
+                logger.info(f"✅ Cookies deleted: {email}")
                 return True
             return False
         except Exception as e:
-            print(f"❌ Error deleting cookies: {str(e)}")
+            logger.error(f"❌ Error deleting cookies: {str(e)}")
             return False
     
     def cookies_exist(self, email: str) -> bool:
@@ -106,20 +174,20 @@ class CookieManager:
                 target_email = email.lower()
                 
                 if stored_email != target_email and not email.startswith("epic_"):
-                    print(f"   ℹ️ Cookie email mismatch: {stored_email} != {target_email}")
+                    logger.info(f"   ℹ️ Cookie email mismatch: {stored_email} != {target_email}")
                     return False
 
                 expires_at = datetime.fromisoformat(cookie_data["expires_at"])
                 if datetime.now() > expires_at:
-                    print(f"   ℹ️ Cookie expired: {email}")
+                    logger.info(f"   ℹ️ Cookie expired: {email}")
                     return False
                 
                 return True
             except Exception as e:
-                print(f"   ℹ️ Error checking cookie: {e}")
+                logger.info(f"   ℹ️ Error checking cookie: {e}")
                 return False
         
-        print(f"   ℹ️ Cookie file not found for: {email}")
+        logger.info(f"   ℹ️ Cookie file not found for: {email}")
         return False
 
     def move_cookies(self, old_email: str, new_email: str) -> bool:
@@ -143,15 +211,15 @@ class CookieManager:
                     os.remove(old_path)
                 except Exception:
                     pass
-                print(f"🔁 Cookies remapped: {old_email} -> {new_email}")
+                logger.info(f"🔁 Cookies remapped: {old_email} -> {new_email}")
                 return True
             return False
         except Exception as e:
-            print(f"❌ Error moving cookies: {str(e)}")
+            logger.error(f"❌ Error moving cookies: {str(e)}")
             return False
 
-    def get_expiry_days(self, email: str) -> int:
-        """Return number of days until cookie expiration. Returns -1 if invalid/expired."""
+    def get_expiry(self, email: str) -> datetime | None:
+        """Return the stored expires_at of the cookie jar, or None if missing/invalid."""
         try:
             cookie_file = self._get_cookie_file(email)
             if not os.path.exists(cookie_file):
@@ -160,13 +228,19 @@ class CookieManager:
                      cookie_file = os.path.join(self.cookies_dir, f"{email}_cookies.json")
                 
                 if not os.path.exists(cookie_file):
-                    return -1
+                    return None
 
             with open(cookie_file, 'r') as f:
                 data = json.load(f)
             
-            expires_at = datetime.fromisoformat(data["expires_at"])
-            delta = expires_at - datetime.now()
-            return delta.days
+            return datetime.fromisoformat(data["expires_at"])
         except Exception:
+            return None
+
+    def get_expiry_days(self, email: str) -> int:
+        """Return number of days until cookie expiration. Returns -1 if invalid/expired."""
+        expires_at = self.get_expiry(email)
+        if expires_at is None:
             return -1
+        delta = expires_at - datetime.now()
+        return delta.days
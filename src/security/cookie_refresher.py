@@ -0,0 +1,155 @@
+# Cookie Refresher - proactively revalidate sessions before they expire
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.security.cookie_manager import CookieManager
+from src.utils.config import ConfigManager
+from src.utils.logger import get_logger, log_context
+
+logger = get_logger("refresher")
+
+
+class CookieRefresher:
+    """Background scheduler that re-saves cookie jars nearing expiry.
+
+    Jars are kept in a min-heap ordered by `expires_at`, so only the head has
+    to be inspected to know whether anything is due. The heap lives across
+    polls: refreshed jars are pushed back with their new expiry and it is only
+    rebuilt when the account list changes. Refreshes run inside the configured
+    low-traffic hours, never while a claim run is busy, with bounded
+    concurrency (each refresh costs a browser) and always headless.
+    """
+
+    def __init__(self, account_manager, cookie_manager: CookieManager = None,
+                 is_busy: Callable[[], bool] = None, poll_seconds: int = 900):
+        config = ConfigManager()
+        self.account_manager = account_manager
+        self.cookie_manager = cookie_manager or account_manager.cookie_manager
+        self.is_busy = is_busy or (lambda: False)
+        self.poll_seconds = poll_seconds
+        self.margin = timedelta(days=config.get("cookie_refresh_margin_days", 7))
+        self.window = config.get("cookie_refresh_hours", [2, 6])
+        self.max_concurrency = max(1, int(config.get("cookie_refresh_concurrency", 2)))
+        self._heap: Optional[List[Tuple[datetime, str]]] = None
+        self._heap_key = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _accounts_key(self) -> Tuple:
+        """Changes whenever an account is added, removed, toggled or signed in."""
+        return tuple(sorted(
+            (acc["email"], acc.get("status"), acc.get("last_login"))
+            for acc in self.account_manager.get_all_accounts()
+        ))
+
+    def build_queue(self) -> List[Tuple[datetime, str]]:
+        """Min-heap of (expires_at, email) for every active account with a jar."""
+        heap = []
+        for acc in self.account_manager.get_all_accounts():
+            if acc.get("status") == "disabled":
+                continue
+            expires_at = self.cookie_manager.get_expiry(acc["email"])
+            if expires_at is not None:
+                heapq.heappush(heap, (expires_at, acc["email"]))
+        return heap
+
+    def pop_due(self, heap: List[Tuple[datetime, str]], now: datetime = None) -> List[str]:
+        """Pop every jar that expires within the refresh margin."""
+        now = now or datetime.now()
+        due = []
+        while heap and heap[0][0] - now <= self.margin:
+            expires_at, email = heapq.heappop(heap)
+            if expires_at > now:
+                due.append(email)
+            # Already expired jars cannot be revalidated without a manual login
+        return due
+
+    def in_window(self, now: datetime = None) -> bool:
+        """True inside the configured low-traffic hours (wraps past midnight)."""
+        hour = (now or datetime.now()).hour
+        start, end = self.window
+        if start <= end:
+            return start <= hour < end
+        return hour >= start or hour < end
+
+    def refresh_account(self, email: str) -> bool:
+        """Restore the session from cookies and re-save them (cookie path only)."""
+        with log_context(account=email):
+            return self._refresh(email)
+
+    def _refresh(self, email: str) -> bool:
+        from src.core.epic_drission_connector import EpicDrissionConnector
+
+        connector = EpicDrissionConnector(account_email=email)
+        try:
+            if not connector.initialize(force_headless=True):
+                return False
+            if not connector.login(email, "", allow_manual=False):
+                return False
+            self.account_manager.clear_needs_login(email)
+            # An unchanged jar is not re-saved, so extend its expiry explicitly
+            expires_at = self.cookie_manager.get_expiry(email)
+            if expires_at is None or expires_at - datetime.now() <= self.margin:
+                self.cookie_manager.touch(email)
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Cookie refresh error for {email}: {e}")
+            return False
+        finally:
+            connector.close()
+
+    def run_once(self, now: datetime = None) -> Dict[str, bool]:
+        """Refresh every due jar with bounded concurrency. Returns email -> success."""
+        now = now or datetime.now()
+        key = self._accounts_key()
+        if self._heap is None or key != self._heap_key:
+            self._heap, self._heap_key = self.build_queue(), key
+
+        due = []
+        for email in self.pop_due(self._heap, now):
+            # The jar may have been re-saved since it was queued (claim run, login)
+            expires_at = self.cookie_manager.get_expiry(email)
+            if expires_at is not None and expires_at - now > self.margin:
+                heapq.heappush(self._heap, (expires_at, email))
+            else:
+                due.append(email)
+        if not due:
+            return {}
+
+        logger.info(f"🍪 Refreshing {len(due)} session(s) nearing expiry...")
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            outcomes = dict(zip(due, pool.map(self.refresh_account, due)))
+
+        for email in due:
+            expires_at = self.cookie_manager.get_expiry(email)
+            if expires_at is not None:
+                heapq.heappush(self._heap, (expires_at, email))
+
+        failed = [email for email, ok in outcomes.items() if not ok]
+        if failed:
+            logger.warning(f"⚠️ Session refresh failed for: {', '.join(failed)} (manual login needed)")
+        return outcomes
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                if self.in_window() and not self.is_busy():
+                    self.run_once()
+            except Exception as e:
+                logger.warning(f"⚠️ Cookie refresher error: {e}")
+            self._stop.wait(self.poll_seconds)
+
+    def start(self) -> threading.Thread:
+        """Run the scheduler in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="cookie-refresher")
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,107 @@
+# Session Validator - check stored cookie sessions over plain HTTP
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar
+
+from src.security.cookie_manager import CookieManager
+
+
+class SessionStatus:
+    VALID = "valid"
+    EXPIRED = "expired"
+    UNKNOWN = "unknown"
+
+
+class _NoPersistCookieJar(RequestsCookieJar):
+    """Session-level jar that never stores response cookies.
+
+    The pooled session is shared by every account, so Set-Cookie headers from
+    one account's response must not leak into the next request.
+    """
+
+    def set_cookie(self, cookie, *args, **kwargs):
+        pass
+
+    def extract_cookies(self, response, request):
+        pass
+
+
+_ACCOUNT_URL = "https://www.epicgames.com/account/v2/personal/ajaxGet"
+_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+               "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+_session = None
+
+
+def _get_session() -> requests.Session:
+    """Shared keep-alive session (connection pool reused across accounts)."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        session.cookies = _NoPersistCookieJar()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        session.mount("https://", adapter)
+        session.headers.update({"User-Agent": _USER_AGENT, "Accept": "application/json"})
+        _session = session
+    return _session
+
+
+class SessionValidator:
+    """Classify a stored cookie jar as valid, expired or unknown without a browser."""
+
+    def __init__(self, cookie_manager: CookieManager = None, timeout: int = 10):
+        self.cookie_manager = cookie_manager or CookieManager()
+        self.timeout = timeout
+
+    @staticmethod
+    def _to_jar(cookies: List[Dict]) -> RequestsCookieJar:
+        jar = RequestsCookieJar()
+        for c in cookies:
+            if not isinstance(c, dict) or not c.get("name"):
+                continue
+            jar.set(c["name"], c.get("value", ""),
+                    domain=c.get("domain", ".epicgames.com"), path=c.get("path", "/"))
+        return jar
+
+    def validate_cookies(self, cookies: List[Dict]) -> str:
+        """One authenticated request against the account endpoint."""
+        if not cookies:
+            return SessionStatus.UNKNOWN
+        try:
+            response = _get_session().get(
+                _ACCOUNT_URL, cookies=self._to_jar(cookies),
+                timeout=self.timeout, allow_redirects=False
+            )
+        except requests.RequestException:
+            return SessionStatus.UNKNOWN
+
+        if response.status_code == 200:
+            try:
+                data = response.json()
+            except ValueError:
+                return SessionStatus.UNKNOWN
+            if not isinstance(data, dict):
+                return SessionStatus.UNKNOWN
+            return SessionStatus.VALID if data.get("userInfo") else SessionStatus.EXPIRED
+
+        if response.status_code == 401:
+            return SessionStatus.EXPIRED
+        if response.is_redirect and "/id/login" in response.headers.get("Location", ""):
+            return SessionStatus.EXPIRED
+
+        # 403 is usually a bot challenge, not a verdict on the session
+        return SessionStatus.UNKNOWN
+
+    def validate(self, email: str) -> str:
+        return self.validate_cookies(self.cookie_manager.load_cookies(email))
+
+    def validate_many(self, emails: Iterable[str], max_workers: int = 8) -> Dict[str, str]:
+        """Validate several accounts concurrently over the pooled session."""
+        emails = list(emails)
+        if not emails:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(emails))) as pool:
+            return dict(zip(emails, pool.map(self.validate, emails)))
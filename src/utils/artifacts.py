@@ -0,0 +1,155 @@
+import gzip
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Union
+from src.utils.paths import get_data_dir
+from src.utils.logger import get_logger
+
+logger = get_logger("artifacts")
+
+# Debug levels (config "artifact_debug_level")
+OFF = "off"
+FAILURES = "failures"   # Screenshots/HTML only when a claim step fails
+ALL = "all"             # Also the checkout HTML of successful claims
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^\w.@-]+", "_", value or "unknown").strip("_")[:80] or "unknown"
+
+
+class ArtifactWriter:
+    """Write debug screenshots and HTML dumps off the browser threads.
+
+    Callers hand over bytes/strings; compression and disk I/O happen on one
+    background thread fed by a bounded queue (artifacts are dropped, never
+    waited for, when it is full). Files go to
+    `<data dir>/artifacts/<run>/<account>/`, HTML is gzipped, and run folders
+    beyond `artifact_max_age_days` or the `artifact_max_mb` budget are pruned
+    oldest first.
+    """
+
+    def __init__(self, root: str = None, queue_size: int = 32):
+        from src.utils.config import ConfigManager
+        config = ConfigManager()
+        self.root = root or os.path.join(get_data_dir(), "artifacts")
+        self.level = config.get("artifact_debug_level", FAILURES)
+        self.max_bytes = int(config.get("artifact_max_mb", 200)) * 1024 * 1024
+        self.max_age = float(config.get("artifact_max_age_days", 14)) * 86400
+        self.run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def begin_run(self, run_id: str = None) -> str:
+        """Start a new run folder; prunes old artifacts first."""
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        if self.level != OFF:
+            self._ensure_thread()
+            try:
+                self._queue.put_nowait(None)   # Sentinel: prune on the writer thread
+            except queue.Full:
+                pass  # Writer is behind (called from the event loop): prune next run
+        return self.run_id
+
+    def wants(self, failure: bool = True) -> bool:
+        """True if the debug level asks for this kind of artifact."""
+        if self.level == ALL:
+            return True
+        return failure and self.level == FAILURES
+
+    def submit(self, account: str, name: str, data: Union[bytes, str]) -> bool:
+        """Queue one file (`name` ends in .png or .html). Returns False if dropped."""
+        if self.level == OFF or not data:
+            return False
+        self._ensure_thread()
+        folder = os.path.join(self.root, self.run_id, _safe_name(account))
+        try:
+            self._queue.put_nowait((folder, _safe_name(name), data))
+            return True
+        except queue.Full:
+            logger.warning(f"   ⚠️ Artifact queue full, dropped {name}")
+            return False
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait (bounded) until queued artifacts are on disk."""
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.05)
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._worker, daemon=True, name="artifact-writer")
+            self._thread.start()
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    self.enforce_quota()
+                else:
+                    self._write(*item)
+            except Exception as e:
+                logger.warning(f"   ⚠️ Artifact write error: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, folder: str, name: str, data: Union[bytes, str]):
+        os.makedirs(folder, exist_ok=True)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        path = os.path.join(folder, name)
+        if name.endswith(".html"):
+            path += ".gz"
+            data = gzip.compress(data, compresslevel=6)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def enforce_quota(self) -> int:
+        """Delete run folders past the age limit, then oldest first over the size budget."""
+        if not os.path.isdir(self.root):
+            return 0
+        runs = []
+        for entry in os.scandir(self.root):
+            if not entry.is_dir() or entry.name == self.run_id:
+                continue
+            size = 0
+            for base, _, files in os.walk(entry.path):
+                for f in files:
+                    try:
+                        size += os.path.getsize(os.path.join(base, f))
+                    except OSError:
+                        pass
+            runs.append((entry.stat().st_mtime, size, entry.path))
+
+        runs.sort()
+        total = sum(size for _, size, _ in runs)
+        now = time.time()
+        removed = 0
+        for mtime, size, path in runs:
+            if now - mtime <= self.max_age and total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+_writer: Optional[ArtifactWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_artifact_writer() -> ArtifactWriter:
+    """Process-wide artifact writer."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ArtifactWriter()
+        return _writer
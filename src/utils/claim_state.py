@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+from src.utils.paths import get_data_dir
+from src.utils.event_bus import get_event_bus
+
+
+class ClaimState:
+    """Claim flow states, in order."""
+
+    NEW = "new"
+    PDP = "pdp"                        # Store page loaded, signed in
+    CTA = "cta"                        # Get button found
+    CHECKOUT = "checkout"              # Checkout opened
+    PRICE_VERIFIED = "price_verified"  # Total verified as free
+    ORDER_PLACED = "order_placed"      # Place Order clicked (written just before the click)
+    CONFIRMED = "confirmed"            # Game is in the library
+
+    ORDER = [NEW, PDP, CTA, CHECKOUT, PRICE_VERIFIED, ORDER_PLACED, CONFIRMED]
+
+    # Surviving a restart: the browser is gone, so earlier states start over at the
+    # store page, but an order that may have been placed must never be placed again.
+    DURABLE = (ORDER_PLACED, CONFIRMED)
+
+
+class ClaimCheckpoint:
+    """State of one (account, offer) claim; every transition is persisted."""
+
+    def __init__(self, store: "ClaimStateStore", key: str, record: Dict):
+        self._store = store
+        self.key = key
+        self.record = record
+        self._last = time.monotonic()
+
+    @property
+    def state(self) -> str:
+        return self.record.get("state", ClaimState.NEW)
+
+    def advance(self, state: str) -> None:
+        """Move forward to `state`, recording how long the previous step took."""
+        if ClaimState.ORDER.index(state) <= ClaimState.ORDER.index(self.state):
+            return
+        now = time.monotonic()
+        seconds = round(now - self._last, 2)
+
+        def move(record: Dict) -> None:
+            record["state"] = state
+            record["updated"] = datetime.now().isoformat()
+            record["transitions"].append({"state": state, "at": record["updated"], "seconds": seconds})
+
+        self.record = self._store.update(self.key, self.record, move)
+        self._last = now
+        get_event_bus().publish("progress", account=self.record.get("account"),
+                                game_id=self.record.get("game_id"), state=state)
+
+    def restart(self) -> None:
+        """Forget progress and start over from the store page."""
+        def reset(record: Dict) -> None:
+            record["state"] = ClaimState.NEW
+            record["transitions"] = []
+
+        self.record = self._store.update(self.key, self.record, reset)
+        self._last = time.monotonic()
+
+    def timings(self) -> str:
+        """e.g. 'pdp 6.1s → cta 5.3s → checkout 14.0s' for the current attempt."""
+        return " → ".join(f"{t['state']} {t['seconds']:.1f}s" for t in self.record.get("transitions", []))
+
+
+class ClaimStateStore:
+    """Persist claim progress per (account, offer) so a crashed run can resume."""
+
+    MAX_AGE = timedelta(days=30)
+
+    def __init__(self, path: str = None):
+        if path is None:
+            path = os.path.join(get_data_dir(), "claim_state.json")
+        self.path = path
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._data: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def _key(account_email: str, game_id: str) -> str:
+        return f"{account_email}|{game_id}"
+
+    def _load(self) -> None:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except Exception:
+                self._data = {}
+        # Drop stale records (offers long gone)
+        cutoff = (datetime.now() - self.MAX_AGE).isoformat()
+        self._data = {k: v for k, v in self._data.items() if v.get("updated", "") >= cutoff}
+
+    def _save(self) -> None:
+        # Atomic replace: a crash mid-write must not lose the checkpoint we rely on
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def update(self, key: str, record: Dict, mutate: Callable[[Dict], None]) -> Dict:
+        """Apply `mutate` to a copy of `record`, store and save it under the lock.
+
+        Stored records are never changed in place, so _save() cannot see a
+        record half-way through a transition.
+        """
+        with self._lock:
+            updated = dict(record, transitions=list(record.get("transitions", [])))
+            mutate(updated)
+            self._data[key] = updated
+            self._save()
+            return updated
+
+    def checkpoint(self, account_email: str, game_id: str) -> ClaimCheckpoint:
+        """Resume the stored claim, or start a new one."""
+        key = self._key(account_email, game_id)
+        with self._lock:
+            record = dict(self._data.get(key) or {})
+        if record.get("state") not in ClaimState.DURABLE:
+            record.update(state=ClaimState.NEW, transitions=[])
+        record.setdefault("account", account_email)
+        record.setdefault("game_id", game_id)
+        record["attempts"] = record.get("attempts", 0) + 1
+        record.setdefault("updated", datetime.now().isoformat())
+        return ClaimCheckpoint(self, key, record)
+
+    def get_state(self, account_email: str, game_id: str) -> str:
+        with self._lock:
+            return (self._data.get(self._key(account_email, game_id)) or {}).get("state", ClaimState.NEW)
+
+    def clear(self, account_email: str, game_id: str) -> None:
+        """Drop the record once the claim is safely in ClaimedHistory."""
+        with self._lock:
+            if self._data.pop(self._key(account_email, game_id), None) is not None:
+                self._save()
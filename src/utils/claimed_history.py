@@ -1,8 +1,59 @@
+import bisect
 import json
 import os
+import re
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Iterable, Optional, Set, Tuple
 from src.utils.paths import get_data_dir
+from src.utils.event_bus import get_event_bus
+
+MAX_LOGS = 1000
+
+# Symbols/codes seen in Epic price strings -> ISO currency
+_CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "₺": "TRY", "TL": "TRY", "¥": "JPY", "₩": "KRW", "R$": "BRL", "₽": "RUB", "zł": "PLN"}
+_NUMBER = re.compile(r"\d[\d.,\s]*")
+
+
+def normalize_price(price) -> Tuple[float, str]:
+    """"$29.99" / "₺149,00" / "1.299,00 TRY" / "Free" -> (amount, currency).
+
+    Unknown or unparsable prices are (0.0, "").
+    """
+    if isinstance(price, (int, float)):
+        return float(price), "USD"
+    text = str(price or "").strip()
+    match = _NUMBER.search(text)
+    if not match:
+        return 0.0, ""
+    number = match.group().replace(" ", "").rstrip(".,")
+    rest = (text[:match.start()] + " " + text[match.end():]).strip()
+
+    # Decimal separator is the last of "." / "," when followed by 1-2 digits
+    last = max(number.rfind("."), number.rfind(","))
+    if last != -1 and len(number) - last - 1 in (1, 2):
+        number = number[:last].replace(".", "").replace(",", "") + "." + number[last + 1:]
+    else:
+        number = number.replace(".", "").replace(",", "")
+    try:
+        amount = float(number)
+    except ValueError:
+        return 0.0, ""
+
+    currency = ""
+    code = re.search(r"\b[A-Z]{3}\b", rest)
+    if code:
+        currency = code.group()
+    else:
+        for symbol in sorted(_CURRENCY_SYMBOLS, key=len, reverse=True):
+            if symbol in rest:
+                currency = _CURRENCY_SYMBOLS[symbol]
+                break
+    return amount, currency
+
+
+def _tokens(name: str) -> Set[str]:
+    """Every suffix of every word, so a word found anywhere in a name is a prefix of one."""
+    return {word[i:] for word in re.findall(r"\w+", name) for i in range(len(word))}
 
 
 class ClaimedHistory:
@@ -17,11 +68,21 @@ class ClaimedHistory:
         self._data = {
             "global_claims": {},  # Deduped by game_id
             "account_claims": {}, # game_ids claimed per account
-            "recent_logs": []     # For UI display
+            "recent_logs": [],    # For UI display
+            "id_aliases": {}      # Legacy slug/name ids -> canonical "namespace:offer_id"
         }
-        self._load()
+        # In-memory set index of account_claims for O(1) membership checks
+        self._account_index: Dict[str, Set[str]] = {}
+        # Derived from recent_logs (never saved): running stats and name search index
+        self._aggregates: Dict[str, Dict] = {}
+        self._name_counts: Dict[str, int] = {}    # lowercase name -> logs with it
+        self._token_names: Dict[str, Set[str]] = {}
+        self._sorted_tokens: List[str] = []
+        self.reload()
 
-    def _load(self) -> None:
+    def reload(self) -> bool:
+        """(Re)read the file. False if it exists but could not be parsed."""
+        ok = True
         if os.path.exists(self.path):
             try:
                 with open(self.path, "r", encoding="utf-8") as f:
@@ -29,19 +90,142 @@ class ClaimedHistory:
                     # Merge loaded data with default structure to handle schema evolution
                     self._data.update(loaded_data)
             except Exception:
-                # If loading fails, keep the default empty structure
-                pass
+                # If loading fails, keep the current structure (e.g. a half-written file)
+                ok = False
+        self._rebuild_index()
+        self._rebuild_log_index()
+        return ok
+
+    def _rebuild_index(self) -> None:
+        self._account_index = {
+            account: set(game_ids)
+            for account, game_ids in self._data.get("account_claims", {}).items()
+        }
+
+    # --- Log index: aggregates + name search ---
+
+    @staticmethod
+    def _normalize_log(log: Dict) -> None:
+        """Fill price_value/currency on logs written before they existed."""
+        if "price_value" not in log:
+            log["price_value"], log["currency"] = normalize_price(log.get("price"))
+
+    def _rebuild_log_index(self) -> None:
+        self._aggregates = {}
+        self._name_counts = {}
+        self._token_names = {}
+        for log in self._data.get("recent_logs", []):
+            self._normalize_log(log)
+            self._index_log(log, 1)
+        self._sorted_tokens = sorted(self._token_names)
+
+    def _index_log(self, log: Dict, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one log from the aggregates and name index."""
+        status = log.get("status", "Success")
+        day = log.get("date", "")[:10]
+        for key in ("all", f"account:{log.get('account', '')}", f"status:{status}", f"day:{day}",
+                    f"day:{day}|status:{status}"):
+            bucket = self._aggregates.setdefault(key, {"count": 0, "value": 0.0, "by_currency": {}})
+            bucket["count"] += sign
+            if status == "Success":
+                currency = log.get("currency", "")
+                bucket["value"] += sign * log.get("price_value", 0.0)
+                bucket["by_currency"][currency] = bucket["by_currency"].get(currency, 0.0) + sign * log.get("price_value", 0.0)
+            if bucket["count"] <= 0:
+                del self._aggregates[key]
+
+        name = log.get("game_name", "Unknown").lower()
+        count = self._name_counts.get(name, 0) + sign
+        if count > 0:
+            self._name_counts[name] = count
+            if sign > 0 and count == 1:
+                for token in _tokens(name):
+                    if token not in self._token_names:
+                        bisect.insort(self._sorted_tokens, token)
+                    self._token_names.setdefault(token, set()).add(name)
+            return
+        self._name_counts.pop(name, None)
+        for token in _tokens(name):
+            names = self._token_names.get(token)
+            if names is None:
+                continue
+            names.discard(name)
+            if not names:
+                del self._token_names[token]
+                i = bisect.bisect_left(self._sorted_tokens, token)
+                if i < len(self._sorted_tokens) and self._sorted_tokens[i] == token:
+                    self._sorted_tokens.pop(i)
 
     def _save(self) -> None:
         with open(self.path, "w", encoding="utf-8") as f:
             json.dump(self._data, f, indent=2, ensure_ascii=False)
 
+    def resolve_id(self, game_id: str) -> str:
+        """Map a legacy slug/name id onto its canonical catalog id (if migrated)."""
+        return self._data.get("id_aliases", {}).get(game_id, game_id)
+
     def is_claimed(self, game_id: str, account_email: str) -> bool:
-        # Check if the game_id is in the account's claimed list
-        return game_id in self._data.get("account_claims", {}).get(account_email, [])
+        # Check if the game_id is in the account's claimed set
+        return self.resolve_id(game_id) in self._account_index.get(account_email, ())
+
+    def migrate_aliases(self, games: List[Dict]) -> int:
+        """Re-key legacy slug/name based entries onto canonical catalog ids.
+
+        `games` are catalog offers carrying `game_id` and `aliases`.
+        Returns the number of legacy ids that were re-keyed.
+        """
+        global_claims = self._data.setdefault("global_claims", {})
+        account_claims = self._data.setdefault("account_claims", {})
+        known_ids = set(global_claims)
+        for game_ids in account_claims.values():
+            known_ids.update(game_ids)
+
+        # Only re-key ids that actually exist in history
+        rekey = {}
+        for game in games:
+            canonical = game.get("game_id")
+            if not canonical:
+                continue
+            legacy_ids = set(game.get("aliases") or [])
+            if game.get("name"):
+                legacy_ids.add(game["name"].strip().lower())
+            for legacy in legacy_ids:
+                if legacy != canonical and legacy in known_ids:
+                    rekey[legacy] = canonical
+        if not rekey:
+            return 0
+
+        # 1. Global list: keep the earliest record per canonical id
+        for legacy, canonical in rekey.items():
+            record = global_claims.pop(legacy, None)
+            if record is None:
+                continue
+            existing = global_claims.get(canonical)
+            if existing is None or record.get("first_claimed_at", "") < existing.get("first_claimed_at", ""):
+                global_claims[canonical] = record
+
+        # 2. Account lists (order preserved, duplicates collapsed)
+        for account, game_ids in account_claims.items():
+            remapped = []
+            for game_id in game_ids:
+                game_id = rekey.get(game_id, game_id)
+                if game_id not in remapped:
+                    remapped.append(game_id)
+            account_claims[account] = remapped
+
+        # 3. Logs
+        for log in self._data.get("recent_logs", []):
+            if log.get("game_id") in rekey:
+                log["game_id"] = rekey[log["game_id"]]
+
+        self._data.setdefault("id_aliases", {}).update(rekey)
+        self._rebuild_index()
+        self._save()
+        return len(rekey)
 
     def add_claim(self, game_id: str, game_name: str, account_email: str, image_url: str = "", price: str = "Unknown", status: str = "Success"):
         """Add a successful claim to history."""
+        game_id = self.resolve_id(game_id)
         # 1. Update Global List (Deduped by game_id)
         # Find if game exists, if not add it
         if game_id not in self._data["global_claims"]:
@@ -57,10 +241,13 @@ class ClaimedHistory:
             self._data["account_claims"][account_email] = []
         
         # check if already in account list
-        if game_id not in self._data["account_claims"][account_email]:
+        account_set = self._account_index.setdefault(account_email, set())
+        if game_id not in account_set:
+            account_set.add(game_id)
             self._data["account_claims"][account_email].append(game_id)
         
         # 3. Add to Recent Log (for UI)
+        price_value, currency = normalize_price(price)
         log_entry = {
             "game_name": game_name,
             "game_id": game_id,
@@ -69,15 +256,21 @@ class ClaimedHistory:
             "timestamp": datetime.now().timestamp(),
             "image_url": image_url,
             "price": price,
+            "price_value": price_value,
+            "currency": currency,
             "status": status,
             "source": "Epic Games Store"
         }
         self._data["recent_logs"].insert(0, log_entry)
-        # Keep only last 1000 logs
-        if len(self._data["recent_logs"]) > 1000:
-            self._data["recent_logs"] = self._data["recent_logs"][:1000]
+        self._index_log(log_entry, 1)
+        # Keep only last MAX_LOGS logs
+        if len(self._data["recent_logs"]) > MAX_LOGS:
+            for dropped in self._data["recent_logs"][MAX_LOGS:]:
+                self._index_log(dropped, -1)
+            self._data["recent_logs"] = self._data["recent_logs"][:MAX_LOGS]
         
         self._save()
+        get_event_bus().publish("claim", **log_entry)
 
     def list_claims(self) -> List[Dict]:
         # This method's behavior needs to be redefined based on the new data structure.
@@ -89,6 +282,63 @@ class ClaimedHistory:
         """Returns a list of game_ids claimed by a specific account."""
         return self._data.get("account_claims", {}).get(account_email, [])
 
+    def get_claim_record(self, game_id: str) -> Optional[Dict]:
+        """Returns the global record (name, first claim date, ...) for a game_id."""
+        return self._data.get("global_claims", {}).get(game_id)
+
     def get_recent_logs(self) -> List[Dict]:
         """Returns the list of recent claim logs."""
         return self._data.get("recent_logs", [])
+
+    def search_names(self, query: str) -> Set[str]:
+        """Lowercase game names matching `query` (same rule as a substring search).
+
+        Every query word is looked up as a prefix in the sorted index of word
+        suffixes, so a word that starts mid-word is found too and no match
+        means an empty result. Only a query without any word characters
+        scans the distinct names.
+        """
+        query = (query or "").strip().lower()
+        if not query:
+            return set(self._name_counts)
+        words = re.findall(r"\w+", query)
+        if not words:
+            return {name for name in self._name_counts if query in name}
+
+        candidates: Optional[Set[str]] = None
+        for word in words:
+            matched = set()
+            i = bisect.bisect_left(self._sorted_tokens, word)
+            while i < len(self._sorted_tokens) and self._sorted_tokens[i].startswith(word):
+                matched |= self._token_names[self._sorted_tokens[i]]
+                i += 1
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return set()
+        return {name for name in candidates if query in name}
+
+    def search_logs(self, query: str) -> List[Dict]:
+        """Recent logs (newest first) whose game name contains `query`."""
+        names = self.search_names(query)
+        return [log for log in self.get_recent_logs() if log.get("game_name", "Unknown").lower() in names]
+
+    def get_stats(self, account: str = None, status: str = None, days: Iterable[str] = None) -> Dict:
+        """Running totals over recent_logs: {"count", "value", "by_currency"}.
+
+        Filter by one account, one status, or a set of "YYYY-MM-DD" days (days
+        can be combined with status). "value" only counts successful claims.
+        """
+        if days is not None:
+            suffix = f"|status:{status}" if status else ""
+            total = {"count": 0, "value": 0.0, "by_currency": {}}
+            for day in days:
+                bucket = self._aggregates.get(f"day:{day}{suffix}")
+                if bucket:
+                    total["count"] += bucket["count"]
+                    total["value"] += bucket["value"]
+                    for currency, value in bucket["by_currency"].items():
+                        total["by_currency"][currency] = total["by_currency"].get(currency, 0.0) + value
+            return total
+        key = f"account:{account}" if account else f"status:{status}" if status else "all"
+        bucket = self._aggregates.get(key, {"count": 0, "value": 0.0, "by_currency": {}})
+        return {"count": bucket["count"], "value": bucket["value"], "by_currency": dict(bucket["by_currency"])}
@@ -29,7 +29,27 @@ class ConfigManager:
         "custom_data_path": "",
         "headless_mode": False,
         "web_dashboard_enabled": True,
-        "web_port": 5000
+        "web_port": 5000,
+        "cookie_refresh_enabled": True,
+        "cookie_refresh_margin_days": 7,
+        "cookie_refresh_hours": [2, 6],   # Low-traffic window [start, end) in local hours
+        "cookie_refresh_concurrency": 2,
+        "resource_blocking": True,
+        "resource_allow_patterns": [],   # Deny patterns to re-enable (see core/resource_policy.py)
+        "parallel_accounts": 3,
+        "browser_isolation": "process",  # "process": one Chromium per account, "context": shared Chromium, one isolated tab per account
+        "tabs_per_browser": 5,
+        "watchdog_interval_seconds": 30,
+        "watchdog_reap_minutes": 10,
+        "browser_max_rss_mb": 1536,      # Per account (x tabs in a shared browser) incl. renderers; 0 = no limit
+        "browser_max_cpu_percent": 0,    # Sustained CPU limit; 0 = no limit
+        "circuit_failure_threshold": 3,  # Consecutive failures of one claim step (any account) before pausing it
+        "circuit_cooldown_minutes": 15,
+        "artifact_debug_level": "failures",  # "off", "failures" or "all" (also dumps successful checkouts)
+        "artifact_max_mb": 200,
+        "artifact_max_age_days": 14,
+        "thumbnail_cache_mb": 50,         # Cover art cache (data dir/thumbnails)
+        "log_retention_days": 14          # Daily rotated logs/app.jsonl files to keep
     }
     
     def __init__(self):
@@ -0,0 +1,109 @@
+# Event Bus - in-process pub/sub for live status (web dashboard SSE stream)
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+
+class Subscription:
+    """One subscriber's bounded inbox. A slow reader loses its oldest events."""
+
+    def __init__(self, bus: "EventBus", maxsize: int):
+        self._bus = bus
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def _put(self, event: Dict) -> None:
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: float = None) -> Optional[Dict]:
+        """Next event, or None after `timeout` seconds without one."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+
+class EventBus:
+    """Thread-safe fan-out of small JSON-able events.
+
+    publish() never blocks: it stamps the event with an increasing id and
+    copies it into every subscriber's bounded queue. The last `history`
+    events are kept so a reconnecting client can resume after the id it saw
+    last (SSE Last-Event-ID). Listeners are called synchronously in the
+    publishing thread and must be quick (see StatusBoard).
+
+    Event types: "run" (run started/finished), "account" (per-account
+    progress), "progress" (claim step reached), "claim" (history record),
+    "schedule" (Auto-Pilot's next run), "dashboard" (GUI Start/Stop and
+    Auto-Pilot switches).
+    """
+
+    def __init__(self, history: int = 200):
+        self._subscribers: List[Subscription] = []
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._recent: "deque[Dict]" = deque(maxlen=history)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def publish(self, event_type: str, **data) -> Dict:
+        with self._lock:
+            event = {"id": next(self._ids), "type": event_type, "ts": time.time(), "data": data}
+            self._recent.append(event)
+            subscribers = list(self._subscribers)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception:
+                pass  # A broken listener must not break the claim pipeline
+        for sub in subscribers:
+            sub._put(event)
+        return event
+
+    def add_listener(self, callback: Callable[[Dict], None]) -> None:
+        with self._lock:
+            self._listeners.append(callback)
+
+    def subscribe(self, last_event_id: int = None, maxsize: int = 256) -> Subscription:
+        """New subscription; replays buffered events newer than `last_event_id`."""
+        sub = Subscription(self, maxsize)
+        with self._lock:
+            if last_event_id is not None:
+                for event in self._recent:
+                    if event["id"] > last_event_id:
+                        sub._put(event)
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+
+_bus: Optional[EventBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """Process-wide event bus shared by the claim pipeline and the web dashboard."""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = EventBus()
+        return _bus
@@ -1,47 +1,148 @@
-# Logger - Logging sistemi
+# Logger - queue-based structured logging
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import sys
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
-
 from src.utils.paths import get_data_dir
 
+ROOT_LOGGER = "epic_games_collector"
+
+# Context carried by every record: set per run / account task / claim step
+_CONTEXT_FIELDS = ("run_id", "account", "step")
+_context = {name: contextvars.ContextVar(name, default=None) for name in _CONTEXT_FIELDS}
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach run_id/account/step to every record logged inside the block.
+
+    Context variables follow asyncio tasks; blocking calls handed to other
+    threads must copy the context (see AsyncDrissionConnector._call).
+    """
+    tokens = [(_context[k], _context[k].set(v)) for k, v in fields.items() if k in _context]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class _ContextFilter(logging.Filter):
+    """Stamp context fields on the record in the emitting thread (before queueing)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for name, var in _context.items():
+            if not hasattr(record, name):
+                setattr(record, name, var.get())
+        return True
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage().strip(),
+        }
+        for name in _CONTEXT_FIELDS:
+            value = getattr(record, name, None)
+            if value:
+                entry[name] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Console handler that looks up sys.stdout at emit time.
+
+    The GUI swaps sys.stdout for its log widget after logging is set up, so
+    the stream must not be captured once at construction.
+    """
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def _stop_listener():
+    """Drain queued records at exit."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logger(name: str = ROOT_LOGGER) -> logging.Logger:
+    """Configure logging once: callers only enqueue, a listener thread does the I/O.
+
+    Console gets the plain message (same output the app always printed);
+    `<data dir>/logs/app.jsonl` gets one JSON object per record and rotates
+    at midnight.
+    """
+    global _listener
+    root = logging.getLogger(ROOT_LOGGER)
+    with _setup_lock:
+        if _listener is None:
+            log_dir = os.path.join(get_data_dir(), "logs")
+            os.makedirs(log_dir, exist_ok=True)
+
+            from src.utils.config import ConfigManager
+            retention = int(ConfigManager().get("log_retention_days", 14))
+
+            file_handler = logging.handlers.TimedRotatingFileHandler(
+                os.path.join(log_dir, "app.jsonl"), when="midnight",
+                backupCount=retention, encoding="utf-8", delay=True
+            )
+            file_handler.setLevel(logging.DEBUG)
+            file_handler.setFormatter(_JsonFormatter())
+
+            console_handler = _StdoutHandler()
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(logging.Formatter("%(message)s"))
+
+            log_queue = queue.SimpleQueue()
+            queue_handler = logging.handlers.QueueHandler(log_queue)
+            queue_handler.addFilter(_ContextFilter())
+
+            root.setLevel(logging.DEBUG)
+            root.handlers = [queue_handler]
+            root.propagate = False
+
+            _listener = logging.handlers.QueueListener(
+                log_queue, console_handler, file_handler, respect_handler_level=True
+            )
+            _listener.start()
+            atexit.register(_stop_listener)
+
+    if name == ROOT_LOGGER:
+        return root
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
 
-def setup_logger(name: str = "epic_games_collector") -> logging.Logger:
-    """Logger'ı kur"""
-    
-    # Log dizinini oluştur
-    log_dir = os.path.join(get_data_dir(), "logs")
-    os.makedirs(log_dir, exist_ok=True)
-    
-    # Logger oluştur
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
-    
-    # Dosya formatı
-    log_file = os.path.join(log_dir, f"app_{datetime.now().strftime('%Y-%m-%d')}.log")
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.DEBUG)
-    
-    # Konsol formatı
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    
-    # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
-    # Handler'ları ekle
-    if not logger.handlers:
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
-    
-    return logger
+def get_logger(name: str) -> logging.Logger:
+    """Module logger under the app's root logger (e.g. get_logger("claimer"))."""
+    return setup_logger(name)
 
 
 # Global logger
@@ -0,0 +1,100 @@
+# Status Board - pre-rendered /api/status payload, swapped atomically on events
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from src.utils.event_bus import get_event_bus
+
+
+class StatusBoard:
+    """Current run status as a ready-to-send JSON body plus its ETag.
+
+    `running`/`status` mirror the dashboard's Start/Stop state (what
+    /api/start and /api/stop act on); `run_active` says whether a claim run
+    is executing right now. Events (see event_bus) are folded into a new state
+    dict, serialized once and published by replacing `current`, a single
+    (body, etag) tuple. Readers just take that reference: no lock, no Tk
+    widget access and no history file reads per request.
+    """
+
+    RECENT_CLAIMS = 10
+
+    def __init__(self):
+        self._state = {
+            "status": "Stopped",
+            "running": False,
+            "pilot": False,
+            "run_active": False,
+            "run_id": None,
+            "next_run": None,
+            "accounts": {},
+            "logs": self._initial_logs(),
+            "updated": time.time()
+        }
+        self._write_lock = threading.Lock()   # Serializes writers only
+        self.current: Tuple[bytes, str] = self._render(self._state)
+
+    def _initial_logs(self):
+        try:
+            from src.utils.claimed_history import ClaimedHistory
+            return ClaimedHistory().get_recent_logs()[:self.RECENT_CLAIMS]
+        except Exception:
+            return []
+
+    @staticmethod
+    def _render(state: Dict) -> Tuple[bytes, str]:
+        body = json.dumps(state, ensure_ascii=False).encode("utf-8")
+        return body, hashlib.sha1(body).hexdigest()[:16]
+
+    def apply(self, event: Dict) -> None:
+        """Event bus listener: fold one event into a new snapshot."""
+        data = event["data"]
+        with self._write_lock:
+            state = dict(self._state)
+            kind = event["type"]
+            if kind == "dashboard":
+                if "running" in data:
+                    state.update(running=data["running"], status="Running" if data["running"] else "Stopped")
+                if "pilot" in data:
+                    state["pilot"] = data["pilot"]
+            elif kind == "run":
+                active = data.get("state") == "started"
+                state.update(run_active=active, run_id=data.get("run_id"))
+                if active:
+                    state["accounts"] = {}
+            elif kind == "account":
+                accounts = dict(state["accounts"])
+                accounts[data["email"]] = dict(accounts.get(data["email"], {}), **data)
+                state["accounts"] = accounts
+            elif kind == "progress":
+                accounts = dict(state["accounts"])
+                entry = dict(accounts.get(data.get("account"), {}))
+                entry.update(step=data.get("state"), game_id=data.get("game_id"))
+                accounts[data.get("account")] = entry
+                state["accounts"] = accounts
+            elif kind == "claim":
+                state["logs"] = ([data] + state["logs"])[:self.RECENT_CLAIMS]
+            elif kind == "schedule":
+                state["next_run"] = data.get("next_run")
+            else:
+                return
+            state["updated"] = event["ts"]
+            rendered = self._render(state)
+            self._state = state
+            self.current = rendered
+
+
+_board: Optional[StatusBoard] = None
+_board_lock = threading.Lock()
+
+
+def get_status_board() -> StatusBoard:
+    """Process-wide status board, subscribed to the event bus on first use."""
+    global _board
+    with _board_lock:
+        if _board is None:
+            _board = StatusBoard()
+            get_event_bus().add_listener(_board.apply)
+        return _board
@@ -0,0 +1,126 @@
+import hashlib
+import os
+import threading
+from io import BytesIO
+from typing import Iterable, Optional, Tuple
+
+import requests
+from PIL import Image, ImageOps
+
+from src.utils.paths import get_data_dir
+from src.utils.logger import get_logger
+
+logger = get_logger("thumbnails")
+
+Size = Tuple[int, int]
+
+# Stored resolution of History cover art (shown at 40x50, 2x for HiDPI)
+HISTORY_SIZE: Size = (80, 100)
+
+
+class ThumbnailStore:
+    """Disk cache of resized cover art, keyed by a hash of the URL and size.
+
+    Downloads, decoding and resizing happen in the caller's thread (the GUI
+    calls this from a worker pool). Files are small PNGs under
+    `<data dir>/thumbnails/`; the folder is pruned to `thumbnail_cache_mb`,
+    least recently used first.
+    """
+
+    def __init__(self, root: str = None, timeout: float = 5):
+        from src.utils.config import ConfigManager
+        self.root = root or os.path.join(get_data_dir(), "thumbnails")
+        self.max_bytes = int(ConfigManager().get("thumbnail_cache_mb", 50)) * 1024 * 1024
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def path_for(self, url: str, size: Size) -> str:
+        digest = hashlib.sha1(f"{url}|{size[0]}x{size[1]}".encode("utf-8")).hexdigest()
+        return os.path.join(self.root, digest[:2], f"{digest}.png")
+
+    def load(self, url: str, size: Size) -> Optional[Image.Image]:
+        """Thumbnail from disk, or downloaded, resized and cached. None on failure."""
+        if not url:
+            return None
+        path = self.path_for(url, size)
+        if os.path.exists(path):
+            try:
+                os.utime(path)  # LRU order for pruning
+                with Image.open(path) as img:
+                    img.load()
+                    return img
+            except (OSError, ValueError):
+                pass  # Corrupt file: fetch again
+
+        try:
+            response = self._session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            with Image.open(BytesIO(response.content)) as img:
+                thumb = ImageOps.fit(img.convert("RGB"), size, Image.Resampling.LANCZOS)
+        except Exception as e:
+            logger.debug(f"Thumbnail fetch failed for {url}: {e}")
+            return None
+
+        self._save(thumb, path)
+        return thumb
+
+    def prewarm(self, urls: Iterable[str], size: Size = HISTORY_SIZE) -> None:
+        """Fetch missing thumbnails in a daemon thread (fire and forget)."""
+        missing = [url for url in dict.fromkeys(urls) if url and not os.path.exists(self.path_for(url, size))]
+        if not missing:
+            return
+
+        def run():
+            fetched = sum(1 for url in missing if self.load(url, size) is not None)
+            logger.debug(f"Pre-warmed {fetched}/{len(missing)} thumbnail(s)")
+
+        threading.Thread(target=run, daemon=True, name="thumbnail-prewarm").start()
+
+    def _save(self, img: Image.Image, path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            img.save(tmp, format="PNG", optimize=True)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug(f"Thumbnail cache write failed: {e}")
+
+    def prune(self) -> int:
+        """Delete least recently used files until the cache fits its budget."""
+        with self._lock:
+            files = []
+            for base, _, names in os.walk(self.root):
+                for name in names:
+                    path = os.path.join(base, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in files)
+            removed = 0
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                    removed += 1
+                except OSError:
+                    pass
+            return removed
+
+
+_store: Optional[ThumbnailStore] = None
+_store_lock = threading.Lock()
+
+
+def get_thumbnail_store() -> ThumbnailStore:
+    """Process-wide thumbnail disk cache."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ThumbnailStore()
+        return _store
@@ -1,5 +1,6 @@
 
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, jsonify, render_template, request, stream_with_context
+import json
 import threading
 import logging
 import os
@@ -12,6 +13,9 @@ cli.show_server_banner = lambda *x: None
 class WebDashboard:
     def __init__(self, app_controller):
         self.app_controller = app_controller # Reference to GameClaimerApp
+        # Created now so it sees every event from here on
+        from src.utils.status import get_status_board
+        self.status_board = get_status_board()
         
         # Determine template folder relative to this file
         base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -22,6 +26,8 @@ class WebDashboard:
         self.server.add_url_rule('/api/status', 'status', self.api_status)
         self.server.add_url_rule('/api/start', 'start', self.api_start, methods=['POST'])
         self.server.add_url_rule('/api/stop', 'stop', self.api_stop, methods=['POST'])
+        self.server.add_url_rule('/api/browsers', 'browsers', self.api_browsers)
+        self.server.add_url_rule('/api/events', 'events', self.api_events)
         
         # Disable Flask logging
         log = logging.getLogger('werkzeug')
@@ -30,7 +36,8 @@ class WebDashboard:
     def run(self, port=5000):
         try:
             # host='0.0.0.0' allows access from local network
-            self.server.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
+            # threaded: each /api/events stream holds a worker thread
+            self.server.run(host='0.0.0.0', port=port, debug=False, use_reloader=False, threaded=True)
         except Exception as e:
             print(f"❌ Web Dashboard Error: {e}")
 
@@ -38,34 +45,49 @@ class WebDashboard:
         return render_template('index.html')
 
     def api_status(self):
-        # Gather status from App Controller
-        dashboard = self.app_controller.frames.get("dashboard")
-        
-        status_text = "Stopped"
-        is_running = False
-        next_claim = "Unknown"
-        logs = []
-        
-        if dashboard:
-            is_running = getattr(dashboard, "is_running", False)
-            status_text = "Running" if is_running else "Stopped"
-            
-            # Helper to get next claim time if available
-            # This depends on how dashboard exposes this data
-            # For now returning placeholder
-            
-            # Fetch recent logs from history
-            from src.utils.claimed_history import ClaimedHistory
-            history = ClaimedHistory() # Re-instantiate to read latest from disk? Or use dashboard's instance?
-            # Better to use dashboard's instance if possible to avoid file contention
-            # but reading is fine.
-            logs = history.get_recent_logs()[:10] # Top 10
-            
-        return jsonify({
-            "status": status_text,
-            "running": is_running,
-            "logs": logs
-        })
+        # Pre-rendered snapshot kept current by the claim pipeline (see utils/status.py)
+        body, etag = self.status_board.current
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype="application/json")
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"  # Always revalidate, 304 is cheap
+        return response
+
+    def api_events(self):
+        """Server-Sent Events: run/account/progress/claim events as they happen.
+
+        Browsers reconnect on their own and send Last-Event-ID, so events
+        missed in between are replayed from the bus buffer.
+        """
+        from src.utils.event_bus import get_event_bus
+        try:
+            last_id = int(request.headers.get("Last-Event-ID") or request.args.get("last_id"))
+        except (TypeError, ValueError):
+            last_id = None
+        subscription = get_event_bus().subscribe(last_id)
+
+        def stream():
+            try:
+                yield "retry: 3000\n\n"
+                while True:
+                    event = subscription.get(timeout=15)
+                    if event is None:
+                        yield ": keep-alive\n\n"  # Also detects closed clients
+                        continue
+                    payload = json.dumps(dict(event["data"], ts=event["ts"]), ensure_ascii=False)
+                    yield f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+            finally:
+                subscription.close()
+
+        return Response(stream_with_context(stream()), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    def api_browsers(self):
+        # Live RSS/CPU of each browser session (sampled by the watchdog)
+        from src.core.browser_watchdog import get_watchdog
+        return jsonify({"browsers": get_watchdog().stats()})
 
     def api_start(self):
         dashboard = self.app_controller.frames.get("dashboard")
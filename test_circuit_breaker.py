@@ -0,0 +1,81 @@
+import pytest
+
+import src.core.circuit_breaker as circuit_breaker
+from src.core.circuit_breaker import CircuitBreaker, CircuitOpen
+
+KEY = ("store.epicgames.com", "checkout")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return clock
+
+
+def open_circuit(breaker):
+    for _ in range(breaker.threshold):
+        breaker.check(KEY)
+        breaker.record_failure(KEY)
+
+
+def test_opens_after_threshold_failures(clock):
+    breaker = CircuitBreaker(threshold=3, cooldown=60)
+    breaker.record_failure(KEY)
+    breaker.record_success(KEY)   # Resets the count
+    breaker.record_failure(KEY)
+    breaker.record_failure(KEY)
+    breaker.check(KEY)
+
+    breaker.record_failure(KEY)
+    with pytest.raises(CircuitOpen) as excinfo:
+        breaker.check(KEY)
+    assert excinfo.value.retry_in == 60
+    assert [c.key for c in breaker.blocked("store.epicgames.com")] == [KEY]
+    assert breaker.blocked("other.host") == []
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    open_circuit(breaker)
+
+    clock.now += 61
+    breaker.check(KEY)                 # This caller is the probe
+    with pytest.raises(CircuitOpen):
+        breaker.check(KEY)             # Everyone else waits for its outcome
+    breaker.record_success(KEY)
+    breaker.check(KEY)
+    assert breaker.blocked() == []
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    open_circuit(breaker)
+
+    clock.now += 61
+    breaker.check(KEY)
+    breaker.record_failure(KEY)
+    with pytest.raises(CircuitOpen):
+        breaker.check(KEY)
+    clock.now += 61
+    breaker.check(KEY)                 # Next cooldown over: a new probe
+
+
+def test_release_frees_an_interrupted_probe(clock):
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    open_circuit(breaker)
+
+    clock.now += 61
+    breaker.check(KEY)
+    breaker.release(KEY)               # Probe cancelled without an outcome
+    breaker.check(KEY)                 # Another caller may probe now
+    with pytest.raises(CircuitOpen):
+        breaker.check(KEY)
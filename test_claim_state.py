@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from src.utils.claim_state import ClaimState, ClaimStateStore
+
+EMAIL = "one@example.com"
+GAME = "ns:test-game"
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("EPIC_DATA_DIR", str(tmp_path))
+    return ClaimStateStore(path=str(tmp_path / "claim_state.json"))
+
+
+def stored(store):
+    with open(store.path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_advance_persists_forward_moves_only(store):
+    checkpoint = store.checkpoint(EMAIL, GAME)
+    assert checkpoint.state == ClaimState.NEW
+
+    checkpoint.advance(ClaimState.PDP)
+    checkpoint.advance(ClaimState.CHECKOUT)
+    checkpoint.advance(ClaimState.CTA)     # Backwards: ignored
+
+    assert checkpoint.state == ClaimState.CHECKOUT
+    assert store.get_state(EMAIL, GAME) == ClaimState.CHECKOUT
+    record = stored(store)[f"{EMAIL}|{GAME}"]
+    assert [t["state"] for t in record["transitions"]] == [ClaimState.PDP, ClaimState.CHECKOUT]
+    assert checkpoint.timings().startswith("pdp ")
+
+
+def test_restart_forgets_progress(store):
+    checkpoint = store.checkpoint(EMAIL, GAME)
+    checkpoint.advance(ClaimState.PRICE_VERIFIED)
+    checkpoint.restart()
+
+    assert checkpoint.state == ClaimState.NEW
+    assert checkpoint.timings() == ""
+    assert stored(store)[f"{EMAIL}|{GAME}"]["state"] == ClaimState.NEW
+
+
+def test_resume_keeps_only_durable_states(store):
+    checkpoint = store.checkpoint(EMAIL, GAME)
+    checkpoint.advance(ClaimState.CHECKOUT)
+    resumed = ClaimStateStore(path=store.path).checkpoint(EMAIL, GAME)
+    assert resumed.state == ClaimState.NEW          # Browser is gone: start over
+
+    resumed.advance(ClaimState.ORDER_PLACED)
+    resumed = ClaimStateStore(path=store.path).checkpoint(EMAIL, GAME)
+    assert resumed.state == ClaimState.ORDER_PLACED  # Never place the order twice
+    assert resumed.record["attempts"] == 3
+
+
+def test_clear_drops_the_record(store):
+    store.checkpoint(EMAIL, GAME).advance(ClaimState.CONFIRMED)
+    store.clear(EMAIL, GAME)
+
+    assert store.get_state(EMAIL, GAME) == ClaimState.NEW
+    assert stored(store) == {}
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+
+from src.utils.claimed_history import ClaimedHistory, MAX_LOGS, normalize_price
+
+
+@pytest.mark.parametrize("price, expected", [
+    ("$29.99", (29.99, "USD")),
+    ("₺149,00", (149.0, "TRY")),
+    ("1.299,00 TRY", (1299.0, "TRY")),
+    ("1,299.00 USD", (1299.0, "USD")),
+    ("€ 5", (5.0, "EUR")),
+    ("R$ 39,90", (39.9, "BRL")),
+    (12, (12.0, "USD")),
+    ("Free", (0.0, "")),
+    ("Unknown", (0.0, "")),
+    (None, (0.0, "")),
+])
+def test_normalize_price(price, expected):
+    assert normalize_price(price) == expected
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    monkeypatch.setenv("EPIC_DATA_DIR", str(tmp_path))
+    return ClaimedHistory(path=str(tmp_path / "claimed_history.json"))
+
+
+def test_aggregates_follow_claims_and_reload(history):
+    history.add_claim("ns:a", "The Witcher 3", "one@example.com", price="$29.99")
+    history.add_claim("ns:b", "Control", "two@example.com", price="₺149,00")
+    history.add_claim("ns:c", "Hades", "one@example.com", price="$24.99", status="Failed")
+
+    assert history.get_stats()["count"] == 3
+    assert history.get_stats()["value"] == pytest.approx(29.99 + 149.0)  # Failed claims add no value
+    assert history.get_stats(account="one@example.com")["count"] == 2
+    assert history.get_stats(status="Failed") == {"count": 1, "value": 0.0, "by_currency": {}}
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    by_day = history.get_stats(status="Success", days=[today, "2000-01-01"])
+    assert by_day["count"] == 2
+    assert by_day["by_currency"] == {"USD": pytest.approx(29.99), "TRY": pytest.approx(149.0)}
+
+    # Aggregates rebuilt from disk match the running totals
+    reloaded = ClaimedHistory(path=history.path)
+    assert reloaded.get_stats() == history.get_stats()
+
+
+def test_aggregates_drop_rotated_logs(history):
+    for i in range(MAX_LOGS + 5):
+        history._data["recent_logs"].insert(0, {
+            "game_name": f"Game {i}", "account": "one@example.com", "date": "2024-01-01 10:00",
+            "price": "$1.00", "status": "Success"
+        })
+    history._rebuild_log_index()
+    history.add_claim("ns:new", "Newest Game", "one@example.com", price="$1.00")
+
+    assert len(history.get_recent_logs()) == MAX_LOGS
+    assert history.get_stats()["count"] == MAX_LOGS
+    assert history.search_names("game 0") == set()   # Rotated out of the index too
+
+
+def test_search_names(history):
+    for i, name in enumerate(["The Witcher 3", "Witch It", "Control", "Death Stranding"]):
+        history.add_claim(f"ns:{i}", name, "one@example.com")
+
+    assert history.search_names("witch") == {"the witcher 3", "witch it"}
+    assert history.search_names("WITCHER 3") == {"the witcher 3"}
+    assert history.search_names("itcher") == {"the witcher 3"}        # Starts mid-word
+    assert history.search_names("ath strand") == {"death stranding"}
+    assert history.search_names("witcher control") == set()           # Words must be adjacent
+    assert history.search_names("portal") == set()
+    assert history.search_names("") == {"the witcher 3", "witch it", "control", "death stranding"}
+    assert [log["game_name"] for log in history.search_logs("witch")] == ["Witch It", "The Witcher 3"]
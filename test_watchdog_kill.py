@@ -0,0 +1,63 @@
+import asyncio
+import threading
+
+import src.core.game_claimer as game_claimer
+from src.core.epic_drission_connector import EpicDrissionConnector
+
+KILLED = "killed@example.com"
+HEALTHY = "healthy@example.com"
+OFFERS = [{"name": "Test Game", "url": "https://store.epicgames.com/en-US/p/test-game", "game_id": "ns:test-game"}]
+
+
+class FakeAccountManager:
+    def get_account(self, email):
+        return {"email": email, "password": "secret"}
+
+    def decrypt_password(self, password):
+        return password
+
+    def update_account_status(self, email, status, **kwargs):
+        pass
+
+    def clear_needs_login(self, email):
+        pass
+
+
+class FakeConnector(EpicDrissionConnector):
+    """No browser: claims take a moment, the KILLED account's browser gets killed meanwhile."""
+
+    def initialize(self, force_visible: bool = False, force_headless: bool = False):
+        return True
+
+    def login(self, email: str, password: str = "", allow_manual: bool = True) -> bool:
+        return True
+
+    def check_claimed_games(self):
+        return []
+
+    def claim_game(self, url, name, checkpoint=None):
+        if self.account_email == KILLED:
+            # What the watchdog thread does when a browser goes over its limit
+            threading.Timer(0.1, self.watchdog_kill).start()
+            self._sleep(5)
+        self._sleep(0.3)
+        return True
+
+
+def test_watchdog_kill_fails_only_that_account(tmp_path, monkeypatch):
+    monkeypatch.setenv("EPIC_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(game_claimer, "EpicDrissionConnector", FakeConnector)
+    claimer = game_claimer.GameClaimer(account_manager=FakeAccountManager())
+
+    async def run():
+        return await asyncio.gather(
+            claimer.claim_free_games_for_account(KILLED, OFFERS),
+            claimer.claim_free_games_for_account(HEALTHY, OFFERS),
+        )
+
+    killed, healthy = asyncio.run(run())
+
+    assert killed["status"] == "error"
+    assert "watchdog" in killed["errors"][0]
+    assert healthy["status"] == "success"
+    assert healthy["claimed_games"] == ["Test Game"]